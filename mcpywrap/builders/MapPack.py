@@ -1,11 +1,24 @@
 # -*- coding: utf-8 -*-
 
 import os
+import sys
 import shutil
 import click
 import json
 
 from ..mcstudio.symlinks import setup_map_packs_symlinks
+from ..utils.utils import json_dumps_bytes
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Linux FICLONE ioctl，用于在 btrfs / XFS 等文件系统上进行写时复制（reflink）
+_FICLONE = 0x40049409
+
+# LevelDB 的表文件写入后不再修改（压缩时生成新文件并删除旧文件），可安全使用硬链接
+_IMMUTABLE_DB_SUFFIXES = ('.ldb', '.sst')
 
 class MapPack(object):
 
@@ -48,22 +61,16 @@ class MapPack(object):
         """
         复制地图数据到目标目录
         """
+        # 已存在的文件不覆盖，源文件不存在时跳过（EAFP，省去事先的存在性检查）
         # level.dat
-        level_dat_path = os.path.join(target_dir, "level.dat")
-        if not os.path.exists(level_dat_path):
-            origin_level_dat_path = os.path.join(self.path, "level.dat")
-            if os.path.exists(origin_level_dat_path):
-                shutil.copy2(origin_level_dat_path, level_dat_path)
+        _copy_file_if_absent(os.path.join(self.path, "level.dat"), os.path.join(target_dir, "level.dat"), clone=True)
         # levelname.txt
-        levelname_txt_path = os.path.join(target_dir, "levelname.txt")
-        if not os.path.exists(levelname_txt_path):
-            origin_levelname_txt_path = os.path.join(self.path, "levelname.txt")
-            if os.path.exists(origin_levelname_txt_path):
-                shutil.copy2(origin_levelname_txt_path, levelname_txt_path)
+        _copy_file_if_absent(os.path.join(self.path, "levelname.txt"), os.path.join(target_dir, "levelname.txt"))
         # db
-        level_db_dir = os.path.join(target_dir, "db")
-        if not os.path.exists(level_db_dir) and os.path.exists(os.path.join(self.path, "db")):
-            shutil.copytree(os.path.join(self.path, "db"), level_db_dir)
+        try:
+            _fast_copytree(os.path.join(self.path, "db"), os.path.join(target_dir, "db"))
+        except (FileExistsError, FileNotFoundError):
+            pass
 
     def copy_resource_packs_to(self, target_map_dir: str):
         """
@@ -103,19 +110,110 @@ class MapPack(object):
             behavior_packs_config = _find_and_extract_pack_info(self.behavior_packs_dir)
             if behavior_packs_config:
                 world_behavior_packs_path = os.path.join(self.path, "world_behavior_packs.json")
-                with open(world_behavior_packs_path, 'w', encoding='utf-8') as f:
-                    json.dump(behavior_packs_config, f, ensure_ascii=False, indent=4)
+                with open(world_behavior_packs_path, 'wb') as f:
+                    f.write(json_dumps_bytes(behavior_packs_config, indent=True))
         
         resource_packs_config = []
         if os.path.exists(self.resource_packs_dir):
             resource_packs_config = _find_and_extract_pack_info(self.resource_packs_dir)
             if resource_packs_config:
                 world_resource_packs_path = os.path.join(self.path, "world_resource_packs.json")
-                with open(world_resource_packs_path, 'w', encoding='utf-8') as f:
-                    json.dump(resource_packs_config, f, ensure_ascii=False, indent=4)
+                with open(world_resource_packs_path, 'wb') as f:
+                    f.write(json_dumps_bytes(resource_packs_config, indent=True))
         
         return behavior_packs_config, resource_packs_config
 
+def _try_reflink(fsrc, fdst):
+    """
+    尝试以写时复制方式克隆文件内容，成功返回True
+
+    普通文件不使用硬链接：游戏会原地修改存档文件，硬链接会导致源地图被一并改写
+    """
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        return True
+    except OSError:
+        return False
+
+def _copy_file_fast(src, dst):
+    """
+    复制单个文件，优先使用系统级复制接口
+
+    Windows 下直接调用 CopyFileW，由内核完成复制；Linux 下优先尝试 reflink，
+    否则使用 shutil.copyfile，其内部会优先使用 sendfile / copy_file_range 等零拷贝系统调用
+    """
+    if sys.platform == "win32":
+        import ctypes
+        if not ctypes.windll.kernel32.CopyFileW(src, dst, False):
+            raise ctypes.WinError()
+        return
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        if _try_reflink(fsrc, fdst):
+            return
+    shutil.copyfile(src, dst)
+
+def _copy_file_if_absent(src, dst, clone=False):
+    """
+    复制文件及其元数据，目标已存在或源文件不存在时直接跳过
+
+    先完整写入同目录下的临时文件，再链接到目标路径，复制中断（如磁盘已满）时不会留下半截的目标文件。
+    clone 为 True 时优先尝试 reflink，否则使用 shutil.copy2，其内部会优先使用 sendfile / copy_file_range 等零拷贝系统调用
+    """
+    tmp_path = f"{dst}.{os.getpid()}.tmp"
+    try:
+        cloned = False
+        if clone:
+            with open(src, 'rb') as fsrc, open(tmp_path, 'wb') as fdst:
+                cloned = _try_reflink(fsrc, fdst)
+        if cloned:
+            shutil.copystat(src, tmp_path)
+        else:
+            shutil.copy2(src, tmp_path)
+        try:
+            # 硬链接不会覆盖已存在的目标，目标已存在时抛出 FileExistsError（EAFP，省去事先的存在性检查）
+            os.link(tmp_path, dst)
+        except FileExistsError:
+            pass
+        except OSError:
+            # 文件系统不支持硬链接时改为重命名（Windows 下目标已存在时同样抛出 FileExistsError）
+            try:
+                os.rename(tmp_path, dst)
+            except FileExistsError:
+                pass
+    except FileNotFoundError:
+        pass
+    finally:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def _fast_copytree(src, dst):
+    """
+    复制目录树，用于地图 db 等体积较大的目录
+
+    与 shutil.copytree 不同，这里不复制文件元数据。LevelDB 表文件只读不改，直接创建硬链接，
+    跨卷等无法链接时与其余文件一样交由 _copy_file_fast 复制。
+    源目录不存在时抛出 FileNotFoundError，目标目录已存在时抛出 FileExistsError
+    """
+    with os.scandir(src) as it:
+        entries = list(it)
+    os.makedirs(dst)
+    for entry in entries:
+        target = os.path.join(dst, entry.name)
+        if entry.is_dir(follow_symlinks=False):
+            _fast_copytree(entry.path, target)
+            continue
+        if entry.name.endswith(_IMMUTABLE_DB_SUFFIXES):
+            try:
+                os.link(entry.path, target)
+                continue
+            except OSError:
+                pass
+        _copy_file_fast(entry.path, target)
+
 def _find_and_extract_pack_info(packs_dir):
     """
     搜索指定目录中的所有包，并从manifest.json中提取信息
@@ -3,8 +3,32 @@
 构建模块包，提供项目构建、文件处理和监控功能
 """
 
-from .project_builder import AddonProjectBuilder
-from .watcher import ProjectWatcher, FileWatcher
-from .dependency_manager import DependencyManager
+import sys
+import importlib
 
 __all__ = ['AddonProjectBuilder', 'ProjectWatcher', 'FileWatcher', 'DependencyManager']
+
+# 导出名称所在的子模块；导入任一子模块（如 dependency_manager）都会先执行本文件，
+# 因此这里不直接导入 project_builder / watcher（及其依赖的 watchdog），首次访问时再加载
+_LAZY_EXPORTS = {
+    'AddonProjectBuilder': '.project_builder',
+    'ProjectWatcher': '.watcher',
+    'FileWatcher': '.watcher',
+    'DependencyManager': '.dependency_manager',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+# Python 3.7 以下不支持模块级 __getattr__，退回到直接导入
+if sys.version_info < (3, 7):
+    from .project_builder import AddonProjectBuilder
+    from .watcher import ProjectWatcher, FileWatcher
+    from .dependency_manager import DependencyManager
@@ -6,12 +6,14 @@
 import os
 import sys
 import json
+import hashlib
 import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Set
 import click
 
 from ..config import CONFIG_FILE, check_has_mcpywrap_config
+from ..utils.utils import json_loads, json_dumps_bytes, write_file_atomic
 from .AddonsPack import AddonsPack
 
 class DependencyNode:
@@ -65,16 +67,84 @@ def _decode_direct_url(direct_url_path: str) -> Optional[str]:
         except json.JSONDecodeError:
             logging.warning(f"无法解析 {direct_url_path} 的JSON内容")
 
+def _read_dist_metadata(metadata_path) -> tuple:
+    """读取METADATA头部中的包名与版本号，返回 (包名, 版本号)"""
+    name = version = None
+    with open(metadata_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith("Name:"):
+                name = line.split(":", 1)[1].strip()
+            elif line.startswith("Version:"):
+                version = line.split(":", 1)[1].strip()
+            # 头部以空行结束，之后是包描述
+            if (name and version) or not line.strip():
+                break
+    return name, version
+
+
+def _get_dist_info_mtime(dist_info_path: str) -> Optional[List[int]]:
+    """
+    获取 .dist-info 目录及其 direct_url.json 的修改时间，不存在时返回None
+
+    卸载或重新安装（包括从其他目录 pip install -e）都会重建 .dist-info，修改时间随之变化
+    """
+    try:
+        return [
+            os.stat(dist_info_path).st_mtime_ns,
+            os.stat(os.path.join(dist_info_path, "direct_url.json")).st_mtime_ns,
+        ]
+    except OSError:
+        return None
+
+
+def _dist_info_still_valid(dist_info: Optional[dict]) -> bool:
+    """检查缓存中记录的已安装分发信息（路径、版本、修改时间）是否仍与当前安装一致"""
+    if not isinstance(dist_info, dict) or not dist_info.get("path"):
+        return False
+    if _get_dist_info_mtime(dist_info["path"]) != dist_info.get("mtime"):
+        return False
+    try:
+        _, version = _read_dist_metadata(os.path.join(dist_info["path"], "METADATA"))
+    except OSError:
+        return False
+    return version == dist_info.get("version")
+
+
+def _get_config_mtime(package_path: str) -> Optional[float]:
+    """获取包配置文件的修改时间，不存在时返回None"""
+    try:
+        return os.path.getmtime(os.path.join(package_path, CONFIG_FILE))
+    except OSError:
+        return None
+
+
+def dependency_cache_key(project_name: str, project_path: str, dependencies: List[str]) -> str:
+    """
+    计算依赖缓存键
+    
+    由项目名称、声明的依赖列表以及项目配置文件的修改时间共同决定
+    """
+    payload = json.dumps({
+        "name": project_name,
+        "dependencies": dependencies,
+        "config_mtime": _get_config_mtime(project_path),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
 class DependencyManager:
     """依赖管理器"""
     def __init__(self):
         self.dependency_map: Dict[str, AddonsPack] = {}
         self.root_node: Optional[DependencyNode] = None
         self.processed_deps: Set[str] = set()
+        self.missing_deps: Set[str] = set()
+        # 各依赖对应的已安装分发信息 {包名: {"path", "version", "mtime"}}，用于校验依赖缓存
+        self.dist_infos: Dict[str, dict] = {}
 
-    def find_dependency_path(self, package_name: str) -> Optional[str]:
+    def _find_dependency_dist(self, package_name: str) -> Optional[tuple]:
         """
-        查找依赖包的真实路径，支持常规安装和pip install -e (编辑安装)
+        查找依赖包的真实路径及其 .dist-info，返回 (包路径, .dist-info路径, 版本号)，未找到时返回None
         """
         # 得到site-packages路径
         for site_package_dir in __import__('site').getsitepackages():
@@ -83,12 +153,7 @@ class DependencyManager:
                 # 读取METADATA文件获取真实包名
                 metadata_path = dist_info / "METADATA"
                 if metadata_path.exists():
-                    pkg_name = None
-                    with open(metadata_path, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            if line.startswith("Name:"):
-                                pkg_name = line.split(":", 1)[1].strip()
-                                break
+                    pkg_name, version = _read_dist_metadata(metadata_path)
 
                     if not pkg_name or pkg_name != package_name:
                         continue
@@ -99,9 +164,16 @@ class DependencyManager:
                         origin_path = _decode_direct_url(str(direct_url_path))
                         if origin_path:
                             # 返回绝对路径
-                            return origin_path
+                            return origin_path, str(dist_info), version
                         continue
         return None
+
+    def find_dependency_path(self, package_name: str) -> Optional[str]:
+        """
+        查找依赖包的真实路径，支持常规安装和pip install -e (编辑安装)
+        """
+        found = self._find_dependency_dist(package_name)
+        return found[0] if found else None
     
     def build_dependency_tree(self, project_name: str, project_path: str, dependencies: List[str]) -> DependencyNode:
         """
@@ -139,10 +211,17 @@ class DependencyManager:
                 continue
                 
             # 查找依赖路径
-            dep_path = self.find_dependency_path(dep_name)
-            if not dep_path:
+            found = self._find_dependency_dist(dep_name)
+            if not found:
                 click.secho(f"⚠️ 警告: 未找到依赖包: {dep_name}", fg="yellow")
+                self.missing_deps.add(dep_name)
                 continue
+            dep_path, dist_info_path, version = found
+            self.dist_infos[dep_name] = {
+                "path": dist_info_path,
+                "version": version,
+                "mtime": _get_dist_info_mtime(dist_info_path),
+            }
                 
             # 创建依赖的AddonsPack
             dep_addon = AddonsPack(dep_name, dep_path)
@@ -173,6 +252,99 @@ class DependencyManager:
             except Exception as e:
                 click.secho(f"⚠️ 警告: 处理 {dep_name} 的子依赖时出错: {str(e)}", fg="yellow")
             
+    def save_to_cache(self, cache_path: str, cache_key: str) -> bool:
+        """
+        将已解析的依赖树写入缓存文件
+        
+        存在未找到的依赖时不写入缓存，以便下次运行时重新解析
+        
+        Args:
+            cache_path: 缓存文件路径
+            cache_key: 缓存键，参见 dependency_cache_key
+            
+        Returns:
+            bool: 是否成功写入
+        """
+        if not self.root_node or self.missing_deps:
+            return False
+
+        def to_dict(node: DependencyNode) -> dict:
+            return {
+                "name": node.name,
+                "path": node.addon_pack.path,
+                "config_mtime": _get_config_mtime(node.addon_pack.path),
+                "dist_info": self.dist_infos.get(node.name),
+                "children": [],
+            }
+
+        tree = to_dict(self.root_node)
+        stack = [(self.root_node, tree)]
+        while stack:
+            node, data = stack.pop()
+            for child in node.children:
+                child_data = to_dict(child)
+                data["children"].append(child_data)
+                stack.append((child, child_data))
+
+        try:
+            # 原子写入，中断时不会留下截断的缓存文件
+            write_file_atomic(cache_path, json_dumps_bytes({"key": cache_key, "tree": tree}))
+            return True
+        except OSError:
+            return False
+
+    def load_from_cache(self, cache_path: str, cache_key: str, project_name: str, project_path: str) -> bool:
+        """
+        从缓存文件恢复依赖树，跳过 site-packages 扫描
+        
+        缓存键不一致、依赖路径已不存在、任一依赖的配置文件发生变化，
+        或依赖已被卸载/重新安装（.dist-info 的路径、版本或修改时间不一致）时视为失效
+        
+        Args:
+            cache_path: 缓存文件路径
+            cache_key: 缓存键，参见 dependency_cache_key
+            project_name: 主项目名称
+            project_path: 主项目路径
+            
+        Returns:
+            bool: 是否成功从缓存恢复
+        """
+        try:
+            with open(cache_path, 'rb') as f:
+                cache = json_loads(f.read())
+        except (OSError, ValueError):
+            return False
+
+        if not isinstance(cache, dict) or cache.get("key") != cache_key:
+            return False
+        tree = cache.get("tree") or {}
+
+        # 先校验所有缓存的依赖是否仍然有效
+        stack = list(tree.get("children", []))
+        while stack:
+            data = stack.pop()
+            if not os.path.isdir(data["path"]) or _get_config_mtime(data["path"]) != data.get("config_mtime"):
+                return False
+            if not _dist_info_still_valid(data.get("dist_info")):
+                return False
+            stack.extend(data.get("children", []))
+
+        # 按原解析顺序（先序）重建依赖树
+        root_addon = AddonsPack(project_name, project_path, is_origin=True)
+        self.root_node = DependencyNode(project_name, root_addon)
+        self.processed_deps = {project_name}
+        stack = [(self.root_node, child) for child in reversed(tree.get("children", []))]
+        while stack:
+            parent_node, data = stack.pop()
+            dep_addon = AddonsPack(data["name"], data["path"])
+            self.dependency_map[data["name"]] = dep_addon
+            self.dist_infos[data["name"]] = data["dist_info"]
+            dep_node = DependencyNode(data["name"], dep_addon, parent_node)
+            parent_node.add_child(dep_node)
+            self.processed_deps.add(data["name"])
+            stack.extend((dep_node, child) for child in reversed(data.get("children", [])))
+        return True
+
     def get_all_dependencies(self) -> Dict[str, AddonsPack]:
         """获取所有依赖"""
         return self.dependency_map
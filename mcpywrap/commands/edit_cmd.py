@@ -10,7 +10,6 @@ import os
 from ..builders.AddonsPack import AddonsPack
 from ..builders.dependency_manager import DependencyManager
 from ..config import config_exists, read_config, get_project_type, get_project_name, get_project_dependencies
-from ..mcstudio.mcs import *
 from ..mcstudio.editor import open_editor, create_editor_config
 from ..utils.project_setup import find_and_configure_behavior_pack
 
@@ -6,60 +6,75 @@
 
 import click
 import os
-import json
+import contextlib
+import re
+import bisect
+import itertools
 import uuid
-import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
-from ..builders import DependencyManager
-from ..builders.MapPack import MapPack
 from ..config import config_exists, read_config, get_project_dependencies, get_project_type, get_project_name, ensure_map_setuptools_sync
-from ..builders.AddonsPack import AddonsPack
-from ..mcstudio.game import open_game, open_safaia
-from ..mcstudio.mcs import get_mcs_download_path, get_mcs_game_engine_dirs, get_mcs_game_engine_data_path, is_windows
-from ..mcstudio.runtime_cppconfig import gen_runtime_config
-from ..mcstudio.symlinks import setup_global_addons_symlinks
-from ..utils.project_setup import find_and_configure_behavior_pack
-from ..utils.utils import ensure_dir
+from ..mcstudio.mcs import get_mcs_download_path, get_mcs_game_engine_dirs, get_mcs_game_engine_data_path, _IS_WINDOWS
+from ..utils.utils import ensure_dir, json_loads, json_dumps_bytes, write_file_atomic
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 from rich.table import Table
-from rich.tree import Tree
-from rich.live import Live
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
+
+# 依赖解析、构建器和 MC Studio 相关模块较重，仅在启动游戏/清理实例时按需导入，
+# 以加快 `mcpy run -l`、`mcpy run -d` 等快速路径的启动速度
 
 # 创建控制台对象
 console = Console()
 
 base_dir = os.getcwd()
+# 运行时实例配置目录
+RUNTIME_DIR = os.path.join(base_dir, ".runtime")
 
 
 # 实例管理助手函数
-def _get_all_instances():
-    """获取所有运行实例信息"""
-    runtime_dir = os.path.join(base_dir, ".runtime")
-    if not os.path.exists(runtime_dir):
-        return []
+# 实例配置文件以 level_id 命名，文件名本身即可确定 level_id
+_INSTANCE_ID_RE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.IGNORECASE)
+
+
+def _get_instance_name(file_path):
+    """读取实例配置文件中的世界名称"""
+    try:
+        with open(file_path, 'rb') as f:
+            config = json_loads(f.read())
+        return config.get('world_info', {}).get('name', '未命名')
+    except:
+        return '未命名'
+
+def _get_all_instances(load_names=False):
+    """
+    获取所有运行实例信息
     
+    Args:
+        load_names: 是否读取配置文件以获取世界名称，默认仅扫描目录
+    """
     instances = []
-    for file in os.listdir(runtime_dir):
-        if file.endswith('.cppconfig'):
-            file_path = os.path.join(runtime_dir, file)
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    level_id = config.get('world_info', {}).get('level_id')
-                    if level_id:
-                        creation_time = os.path.getctime(file_path)
-                        instances.append({
-                            'level_id': level_id,
-                            'config_path': file_path,
-                            'creation_time': creation_time,
-                            'name': config.get('world_info', {}).get('name', '未命名')
-                        })
-            except:
-                continue
+    try:
+        with os.scandir(RUNTIME_DIR) as it:
+            for entry in it:
+                level_id, ext = os.path.splitext(entry.name)
+                if ext != '.cppconfig' or not _INSTANCE_ID_RE.match(level_id):
+                    continue
+                instances.append({
+                    'level_id': level_id,
+                    'config_path': entry.path,
+                    'creation_time': entry.stat().st_ctime
+                })
+    except FileNotFoundError:
+        return []
+
+    if load_names and instances:
+        # 配置文件读取为I/O密集型操作，使用线程池并发读取
+        with ThreadPoolExecutor(max_workers=min(8, len(instances))) as executor:
+            names = executor.map(_get_instance_name, [instance['config_path'] for instance in instances])
+            for instance, name in zip(instances, names):
+                instance['name'] = name
     
     # 按创建时间排序，最新的在前
     instances.sort(key=lambda x: x['creation_time'], reverse=True)
@@ -73,15 +88,42 @@ def _get_latest_instance():
     return None
 
 def _match_instance_by_prefix(prefix):
-    """通过前缀匹配实例"""
+    """通过前缀匹配实例，存在多个匹配时返回最新的实例"""
     if not prefix:
         return None
     
-    instances = _get_all_instances()
-    for instance in instances:
-        if instance['level_id'].startswith(prefix):
-            return instance
-    return None
+    try:
+        with os.scandir(RUNTIME_DIR) as it:
+            ids = sorted(
+                level_id for level_id, ext in (os.path.splitext(entry.name) for entry in it)
+                if ext == '.cppconfig' and _INSTANCE_ID_RE.match(level_id)
+            )
+    except FileNotFoundError:
+        return None
+
+    # 对排序后的ID二分查找，匹配项在列表中连续分布
+    matches = []
+    for level_id in itertools.islice(ids, bisect.bisect_left(ids, prefix), None):
+        if not level_id.startswith(prefix):
+            break
+        matches.append(level_id)
+
+    # 仅对匹配到的实例读取创建时间
+    instances = []
+    for level_id in matches:
+        config_path = f"{RUNTIME_DIR}{os.sep}{level_id}.cppconfig"
+        try:
+            creation_time = os.path.getctime(config_path)
+        except OSError:
+            continue
+        instances.append({
+            'level_id': level_id,
+            'config_path': config_path,
+            'creation_time': creation_time
+        })
+    if not instances:
+        return None
+    return max(instances, key=lambda x: x['creation_time'])
 
 def _generate_new_instance_config(base_dir, project_name):
     """生成新的运行实例配置文件路径"""
@@ -98,6 +140,11 @@ def _generate_new_instance_config(base_dir, project_name):
 
 def _setup_dependencies(project_name, base_dir):
     """设置项目依赖"""
+    from ..builders.AddonsPack import AddonsPack
+    from ..builders.dependency_manager import DependencyManager, dependency_cache_key
+    from ..utils.project_setup import find_and_configure_behavior_pack
+    from rich.tree import Tree
+
     all_packs = []
     project_type = get_project_type()
     config = read_config()
@@ -118,12 +165,18 @@ def _setup_dependencies(project_name, base_dir):
 
     if dependencies:
         with console.status("📦 正在解析依赖包...", spinner="dots"):
-            # 构建依赖树
-            dependency_manager.build_dependency_tree(
-                project_name,
-                base_dir,
-                dependencies
-            )
+            # 优先从缓存恢复依赖树，缓存失效时重新解析并写入缓存
+            cache_path = os.path.join(base_dir, ".runtime", ".depcache.json")
+            cache_key = dependency_cache_key(project_name, base_dir, dependencies)
+            if not dependency_manager.load_from_cache(cache_path, cache_key, project_name, base_dir):
+                # 构建依赖树
+                dependency_manager.build_dependency_tree(
+                    project_name,
+                    base_dir,
+                    dependencies
+                )
+                ensure_dir(os.path.dirname(cache_path))
+                dependency_manager.save_to_cache(cache_path, cache_key)
 
             # 获取所有依赖 - 修复可能的类型错误
             try:
@@ -157,10 +210,14 @@ def _setup_dependencies(project_name, base_dir):
 
 
 def _build_dependency_tree(node, tree_node):
-    """使用Rich的Tree构建依赖树"""
-    for child in node.children:
-        child_node = tree_node.add(f"[cyan]{child.name}[/]")
-        _build_dependency_tree(child, child_node)
+    """使用Rich的Tree构建依赖树（使用显式栈迭代，避免深层依赖时递归过深）"""
+    stack = [(node, tree_node)]
+    while stack:
+        current, current_tree = stack.pop()
+        # 子节点在处理父节点时按顺序添加，因此出栈顺序不影响显示顺序
+        for child in current.children:
+            child_tree = current_tree.add(f"[cyan]{child.name}[/]")
+            stack.append((child, child_tree))
 
 
 def _run_game_with_instance(config_path, level_id, all_packs, wait=True, log_callback=None):
@@ -176,6 +233,12 @@ def _run_game_with_instance(config_path, level_id, all_packs, wait=True, log_cal
     Returns:
         tuple: (成功状态, 游戏进程对象)
     """
+    from ..builders.MapPack import MapPack
+    from ..mcstudio.game import open_game, open_safaia
+    from ..mcstudio.runtime_cppconfig import gen_runtime_config
+    from ..mcstudio.symlinks import setup_global_addons_symlinks
+    from rich.live import Live
+
     project_type = get_project_type()
     project_name = get_project_name()
     
@@ -214,78 +277,90 @@ def _run_game_with_instance(config_path, level_id, all_packs, wait=True, log_cal
     # 生成世界名称
     world_name = project_name
 
-    # 使用Live组件显示整个设置过程
-    with Live(auto_refresh=True, console=console) as live:
-        # 设置软链接
-        live.update(Text("🔄 正在设置软链接...", "cyan"))
-        log_message("🔄 正在设置软链接...", "info")
-        link_suc, behavior_links, resource_links = setup_global_addons_symlinks(all_packs)
-
-        if not link_suc:
-            live.update(Text("❌ 软链接创建失败，请检查权限", "red bold"))
-            log_message("❌ 软链接创建失败，请检查权限", "error")
-            return False, None
-
-        # 显示世界名称
-        live.update(Text(f"🌍 世界名称: {world_name}", "cyan"))
-        log_message(f"🌍 世界名称: {world_name}", "info")
-
-        # 生成运行时配置
-        live.update(Text("📝 生成运行时配置中...", "cyan"))
-        log_message("📝 生成运行时配置中...", "info")
-        runtime_config = gen_runtime_config(
-            latest_engine,
-            world_name,
-            level_id,
-            mcs_download_dir,
-            project_name,
-            behavior_links,
-            resource_links
-        )
+    # 设置过程中的各步骤消息先收集起来，结束后统一以一个面板输出；
+    # 过程中仅用Live显示当前步骤（手动刷新，不启用后台刷新线程），非终端环境下跳过Live渲染
+    setup_steps = []
+    step_styles = {"error": "red bold", "success": "green", "info": "cyan", "warning": "yellow"}
+
+    def print_setup_summary():
+        if setup_steps:
+            summary = Text("\n").join(Text(message, style) for message, style in setup_steps)
+            console.print(Panel(summary, title="🛠️ 运行准备", border_style="cyan", title_align="left"))
+
+    try:
+        live_ctx = Live(auto_refresh=False, transient=True, console=console) if console.is_terminal else contextlib.nullcontext()
+        with live_ctx as live:
+            def setup_step(message, level):
+                if log_callback:
+                    log_callback(message, level)
+                    return
+                style = step_styles.get(level)
+                setup_steps.append((message, style))
+                if live is not None:
+                    live.update(Text(message, style), refresh=True)
+
+            # 设置软链接
+            # 现有链接的名称与目标均与期望一致且没有多余链接时，setup_global_addons_symlinks 会直接复用
+            setup_step("🔄 正在设置软链接...", "info")
+            link_suc, behavior_links, resource_links = setup_global_addons_symlinks(all_packs)
+
+            if not link_suc:
+                setup_step("❌ 软链接创建失败，请检查权限", "error")
+                return False, None
+
+            # 显示世界名称
+            setup_step(f"🌍 世界名称: {world_name}", "info")
+
+            # 生成运行时配置
+            setup_step("📝 生成运行时配置中...", "info")
+            runtime_config = gen_runtime_config(
+                latest_engine,
+                world_name,
+                level_id,
+                mcs_download_dir,
+                project_name,
+                behavior_links,
+                resource_links
+            )
 
-        # 写入配置文件
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(runtime_config, f, ensure_ascii=False, indent=2)
+            # 写入配置文件
+            write_file_atomic(config_path, json_dumps_bytes(runtime_config, indent=True))
 
-        live.update(Text(f"📝 配置文件已生成: {os.path.basename(config_path)}", "green"))
-        log_message(f"📝 配置文件已生成: {os.path.basename(config_path)}", "success")
+            setup_step(f"📝 配置文件已生成: {os.path.basename(config_path)}", "success")
 
-        # 地图存档创建
-        if project_type == 'map':
-            # 判断目标地图存档路径
-            runtime_map_dir = os.path.join(engine_data_path, "minecraftWorlds", level_id)
-            ensure_dir(runtime_map_dir)
+            # 地图存档创建
+            if project_type == 'map':
+                # 判断目标地图存档路径
+                runtime_map_dir = os.path.join(engine_data_path, "minecraftWorlds", level_id)
+                ensure_dir(runtime_map_dir)
 
-            # MapPack
-            map_pack_origin = MapPack(project_name, base_dir)
-            map_pack_target = MapPack(project_name, runtime_map_dir)
+                # MapPack
+                map_pack_origin = MapPack(project_name, base_dir)
+                map_pack_target = MapPack(project_name, runtime_map_dir)
             
-            live.update(Text("🗺️ 正在准备地图存档...", "cyan"))
-            log_message("🗺️ 正在准备地图存档...", "info")
+                setup_step("🗺️ 正在准备地图存档...", "info")
             
-            map_pack_origin.copy_level_data_to(runtime_map_dir)
+                map_pack_origin.copy_level_data_to(runtime_map_dir)
 
-            live.update(Text(f"✓ 已复制地图存档", "green"))
-            log_message(f"✓ 已复制地图存档", "success")
+                setup_step(f"✓ 已复制地图存档", "success")
                 
-            # 链接
-            live.update(Text("🔗 正在设置地图软链接...", "cyan"))
-            log_message("🔗 正在设置地图软链接...", "info")
-            map_pack_origin.setup_packs_symlinks_to(level_id, runtime_map_dir)
-
-            # 创建world_behavior_packs.json和world_resource_packs.json
-            live.update(Text("📄 正在生成包配置文件...", "cyan"))
-            log_message("📄 正在生成包配置文件...", "info")
-            
-            # 处理行为包
-            behavior_packs_config, resource_packs_config = map_pack_target.setup_world_packs_config()
+                # 链接
+                setup_step("🔗 正在设置地图软链接...", "info")
+                map_pack_origin.setup_packs_symlinks_to(level_id, runtime_map_dir)
+
+                # 创建world_behavior_packs.json和world_resource_packs.json
+                setup_step("📄 正在生成包配置文件...", "info")
             
-            live.update(Text(f"✓ 已创建world_behavior_packs.json，包含{len(behavior_packs_config)}个行为包", "green"))
-            log_message(f"✓ 已创建world_behavior_packs.json，包含{len(behavior_packs_config)}个行为包", "success")
+                # 处理行为包
+                behavior_packs_config, resource_packs_config = map_pack_target.setup_world_packs_config()
             
-            live.update(Text(f"✓ 已创建world_resource_packs.json，包含{len(resource_packs_config)}个资源包", "green"))
-            log_message(f"✓ 已创建world_resource_packs.json，包含{len(resource_packs_config)}个资源包", "success")
+                setup_step(f"✓ 已创建world_behavior_packs.json，包含{len(behavior_packs_config)}个行为包", "success")
             
+                setup_step(f"✓ 已创建world_resource_packs.json，包含{len(resource_packs_config)}个资源包", "success")
+    finally:
+        # Live结束后统一输出设置过程摘要
+        print_setup_summary()
+
     # 启动游戏
     logging_port = _gen_random_port()
 
@@ -299,7 +374,7 @@ def _run_game_with_instance(config_path, level_id, all_packs, wait=True, log_cal
         return False, None
 
     # 启动studio_logging_server
-    if is_windows():
+    if _IS_WINDOWS:
         from ..mcstudio.studio_server_ui import run_studio_server_ui_subprocess
         run_studio_server_ui_subprocess(port=logging_port)
 
@@ -375,8 +450,7 @@ def run_cmd(new, list, delete, force, clean_all, instance_prefix):
     project_name = get_project_name()
     
     # 创建运行时配置目录
-    runtime_dir = os.path.join(base_dir, ".runtime")
-    ensure_dir(runtime_dir)
+    ensure_dir(RUNTIME_DIR)
 
     # 清空所有实例
     if clean_all:
@@ -449,7 +523,7 @@ def run_cmd(new, list, delete, force, clean_all, instance_prefix):
 
 def _list_instances():
     """列出所有可用的游戏实例"""
-    instances = _get_all_instances()
+    instances = _get_all_instances(load_names=True)
     
     if not instances:
         console.print("📭 没有找到任何游戏实例", style="yellow")
@@ -494,25 +568,22 @@ def _safe_remove_directory(path):
     Args:
         path: 要删除的目录路径
     """
-    if not os.path.exists(path) and not os.path.islink(path):
-        return
-        
     if os.path.islink(path):
         # 如果是软链接，只删除链接本身
         os.unlink(path)
     elif os.path.isdir(path):
-        # 如果是目录，先处理其内容
-        for item in os.listdir(path):
-            item_path = os.path.join(path, item)
-            if os.path.islink(item_path):
-                # 如果是软链接，只删除链接本身
-                os.unlink(item_path)
-            elif os.path.isdir(item_path):
-                # 递归处理子目录
-                _safe_remove_directory(item_path)
-            else:
-                # 删除文件
-                os.remove(item_path)
+        # 如果是目录，先处理其内容；DirEntry 复用读取目录时得到的类型信息，无需对每一项再 stat
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_symlink():
+                    # 如果是软链接，只删除链接本身
+                    os.unlink(entry.path)
+                elif entry.is_dir(follow_symlinks=False):
+                    # 递归处理子目录
+                    _safe_remove_directory(entry.path)
+                else:
+                    # 删除文件
+                    os.remove(entry.path)
         # 删除空目录
         os.rmdir(path)
     elif os.path.isfile(path):
@@ -531,7 +602,7 @@ def _delete_instance(instance_prefix, force):
     config_path = instance['config_path']
     
     if not force:
-        console.print(f"即将删除实例: {level_id[:8]} ({instance['name']})", style="yellow")
+        console.print(f"即将删除实例: {level_id[:8]} ({_get_instance_name(config_path)})", style="yellow")
         confirmation = click.confirm('确定要删除吗?', abort=True)
     
     with console.status(f"正在删除实例 {level_id[:8]}...", spinner="dots"):
@@ -558,8 +629,26 @@ def _delete_instance(instance_prefix, force):
     console.print(f"✅ 成功删除实例: {level_id[:8]}", style="green")
 
 
+def _delete_instance_files(instance, worlds_root):
+    """删除单个实例的配置文件及对应的游戏存档"""
+    config_path = instance['config_path']
+
+    # 删除配置文件
+    if os.path.exists(config_path):
+        os.remove(config_path)
+
+    # 删除游戏世界目录，未找到游戏存档根目录时只删除配置文件
+    if worlds_root is None:
+        return
+    world_dir = f"{worlds_root}{os.sep}{instance['level_id']}"
+    if os.path.exists(world_dir) or os.path.islink(world_dir):
+        _safe_remove_directory(world_dir)
+
+
 def _clean_all_instances(force):
     """清空所有游戏实例"""
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
+
     instances = _get_all_instances()
     
     if not instances:
@@ -587,45 +676,46 @@ def _clean_all_instances(force):
             console.print("操作已取消", style="green")
             return
     
+    # 获取游戏存档根目录（在循环外计算一次）；未找到时仍删除实例配置，仅跳过游戏存档
+    engine_data_path = get_mcs_game_engine_data_path()
+    if engine_data_path:
+        worlds_root = os.path.join(engine_data_path, "minecraftWorlds")
+    else:
+        worlds_root = None
+        console.print("⚠️ 未找到MC Studio游戏数据目录，将只删除实例配置，不删除游戏存档", style="yellow")
+
     # 开始删除所有实例
     with Progress(
         SpinnerColumn(),
         TextColumn("[yellow]正在删除游戏实例... {task.completed}/{task.total}"),
         BarColumn(),
         TimeElapsedColumn(),
-        console=console
+        console=console,
+        disable=not console.is_terminal
     ) as progress:
         delete_task = progress.add_task("删除", total=len(instances))
         
         success_count = 0
         fail_count = 0
-        
-        for instance in instances:
-            try:
-                level_id = instance['level_id']
-                config_path = instance['config_path']
-                
-                progress.update(delete_task, description=f"删除 {level_id[:8]}")
-                
-                # 删除配置文件
-                if os.path.exists(config_path):
-                    os.remove(config_path)
-                    
-                # 获取游戏引擎数据目录
-                engine_data_path = get_mcs_game_engine_data_path()
-                
-                # 删除游戏世界目录
-                world_dir = os.path.join(engine_data_path, "minecraftWorlds", level_id)
-                if os.path.exists(world_dir) or os.path.islink(world_dir):
-                    _safe_remove_directory(world_dir)
-                    
-                success_count += 1
-            except Exception as e:
-                fail_count += 1
-                if not force:  # 在非强制模式下显示错误
-                    progress.console.print(f"❌ 删除实例 {instance['level_id'][:8]} 时出错: {str(e)}", style="red")
-            
-            progress.advance(delete_task)
+
+        # 各实例的删除互不相关且以磁盘I/O为主，使用线程池并发删除
+        with ThreadPoolExecutor(max_workers=min(8, count)) as executor:
+            futures = {
+                executor.submit(_delete_instance_files, instance, worlds_root): instance
+                for instance in instances
+            }
+            for future in as_completed(futures):
+                instance = futures[future]
+                try:
+                    future.result()
+                    success_count += 1
+                except Exception as e:
+                    fail_count += 1
+                    if not force:  # 在非强制模式下显示错误
+                        progress.console.print(f"❌ 删除实例 {instance['level_id'][:8]} 时出错: {str(e)}", style="red")
+
+                progress.update(delete_task, description=f"删除 {instance['level_id'][:8]}")
+                progress.advance(delete_task)
     
     # 报告结果
     if success_count == count:
@@ -637,13 +727,17 @@ def _clean_all_instances(force):
 
 
 def _print_dependency_tree(node, level):
-    """打印依赖树结构"""
-    indent = "  " * level
-    if level == 0:
-        click.secho(f"{indent}└─ {node.name} (主项目)", fg="bright_cyan")
-    else:
-        click.secho(f"{indent}└─ {node.name}", fg="cyan")
+    """打印依赖树结构（先序遍历，使用显式栈迭代）"""
+    stack = [(node, level)]
+    while stack:
+        current, current_level = stack.pop()
+        indent = "  " * current_level
+        if current_level == 0:
+            click.secho(f"{indent}└─ {current.name} (主项目)", fg="bright_cyan")
+        else:
+            click.secho(f"{indent}└─ {current.name}", fg="cyan")
 
-    for child in node.children:
-        _print_dependency_tree(child, level + 1)
+        # 逆序入栈，保证子节点按原顺序输出
+        for child in reversed(current.children):
+            stack.append((child, current_level + 1))
 
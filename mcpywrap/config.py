@@ -4,10 +4,15 @@
 处理 mcpywrap 配置文件的模块
 """
 import os
-import tomli
 import tomli_w
 import click
 
+# Python 3.11+ 自带 tomllib，优先使用标准库
+try:
+    import tomllib as _toml
+except ImportError:
+    import tomli as _toml
+
 base_dir = os.getcwd()
 CONFIG_FILE = 'pyproject.toml'
 
@@ -30,7 +35,7 @@ def read_config(config_path=None) -> dict:
     
     with open(config_path, 'rb') as f:
         try:
-            config = tomli.load(f)
+            config = _toml.load(f)
             # 确保mcpywrap工具配置部分存在
             if 'tool' not in config:
                 config['tool'] = {}
@@ -42,7 +47,7 @@ def read_config(config_path=None) -> dict:
                 config['project'] = {}
             
             return config
-        except tomli.TOMLDecodeError:
+        except _toml.TOMLDecodeError:
             click.echo(click.style(f"❌ {config_path} 格式错误", fg='red', bold=True))
             return {}
         
@@ -56,9 +61,9 @@ def check_has_mcpywrap_config(config_path=None) -> bool:
     
     with open(config_path, 'rb') as f:
         try:
-            config = tomli.load(f)
+            config = _toml.load(f)
             return 'tool' in config and 'mcpywrap' in config['tool']
-        except tomli.TOMLDecodeError:
+        except _toml.TOMLDecodeError:
             click.echo(click.style(f"❌ {config_path} 格式错误", fg='red', bold=True))
             return False
 
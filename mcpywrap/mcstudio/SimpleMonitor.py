@@ -1,51 +1,115 @@
 # -*- coding: utf-8 -*-
 
+import os
+import time
+import select
+
+import psutil
+
+from .mcs import _IS_WINDOWS
+from .winapi import SYNCHRONIZE, INFINITE
+
+if _IS_WINDOWS:
+    from .winapi import OpenProcess as _OpenProcess, WaitForSingleObject as _WaitForSingleObject, CloseHandle as _CloseHandle
+
 
 class SimpleMonitor:
-    def __init__(self, process_name="Minecraft.Windows.exe"):
+    def __init__(self, process_name="Minecraft.Windows.exe", pid=None, popen=None):
         self.process_name = process_name
-        self.running = False
+        self._popen = popen
+        self._proc = None
+        self.pid = popen.pid if popen is not None else pid
+        self.running = self.pid is not None
 
-        # 检查进程是否已启动
-        import psutil
-        for proc in psutil.process_iter(['name']):
-            if proc.info['name'] == self.process_name:
-                self.running = True
-                break
+        # 附加到已运行的进程时，仅扫描一次进程表获取PID
+        if self.pid is None:
+            self.pid = self._find_pid()
+            self.running = self.pid is not None
+
+    def _find_pid(self):
+        """按进程名查找PID，未找到时返回None"""
+        return next(
+            (proc.info['pid'] for proc in psutil.process_iter(['pid', 'name']) if proc.info['name'] == self.process_name),
+            None
+        )
+
+    def _get_process(self):
+        """获取缓存的psutil.Process对象"""
+        if self._proc is None:
+            self._proc = psutil.Process(self.pid)
+        return self._proc
+
+    def _wait_pid(self):
+        """
+        阻塞等待指定PID的进程结束，由内核在进程退出时唤醒
+
+        Windows 下使用 OpenProcess + WaitForSingleObject，Linux 下使用 pidfd_open + select。
+
+        Returns:
+            bool: 是否成功等待；不支持或打开进程失败时返回False
+        """
+        if _IS_WINDOWS:
+            handle = _OpenProcess(SYNCHRONIZE, False, self.pid)
+            if not handle:
+                return False
+            try:
+                _WaitForSingleObject(handle, INFINITE)
+            finally:
+                _CloseHandle(handle)
+            return True
+
+        pidfd_open = getattr(os, "pidfd_open", None)
+        if pidfd_open is None:
+            return False
+        try:
+            fd = pidfd_open(self.pid)
+        except OSError:
+            return False
+        try:
+            select.select([fd], [], [])
+        finally:
+            os.close(fd)
+        return True
 
     def wait(self):
         """等待进程结束"""
-        import psutil
-        import time
+        if self._popen is not None:
+            self._popen.wait()
+            self.running = False
+            return True
 
-        # 等待游戏启动
+        # 等待游戏启动：前5秒每100毫秒检查一次以便尽快发现进程，之后逐步退避至最长5秒
         start_time = time.time()
-        while not self.running and time.time() - start_time < 30:
-            for proc in psutil.process_iter(['name']):
-                if proc.info['name'] == self.process_name:
-                    self.running = True
-                    break
-            time.sleep(1)
+        interval = 0.1
+        while self.pid is None:
+            elapsed = time.time() - start_time
+            if elapsed >= 30:
+                break
+            time.sleep(interval)
+            interval = 0.1 if elapsed < 5 else min(5.0, interval * 1.5)
+            self.pid = self._find_pid()
 
         # 如果游戏已启动，等待它结束
-        if self.running:
-            while True:
-                found = False
-                for proc in psutil.process_iter(['name']):
-                    if proc.info['name'] == self.process_name:
-                        found = True
-                        break
-                if not found:
-                    break
-                time.sleep(1)
+        if self.pid is not None:
+            self.running = True
+            if not self._wait_pid():
+                try:
+                    self._get_process().wait()
+                except psutil.NoSuchProcess:
+                    pass
+            self.running = False
 
         return True
-    
+
     def poll(self):
         """检查进程是否仍在运行"""
-        import psutil
-
-        for proc in psutil.process_iter(['name']):
-            if proc.info['name'] == self.process_name:
-                return True
-        return False
\ No newline at end of file
+        if self._popen is not None:
+            return self._popen.poll() is None
+        if self.pid is None:
+            self.pid = self._find_pid()
+            if self.pid is None:
+                return False
+        try:
+            return self._get_process().is_running()
+        except psutil.NoSuchProcess:
+            return False
@@ -4,7 +4,7 @@ import click
 import os
 import subprocess
 
-from ..mcstudio.mcs import *
+from ..mcstudio.mcs import get_mcs_download_path, get_mcs_game_engine_dirs, get_mcs_install_location
 from .SimpleMonitor import SimpleMonitor
 
 
@@ -21,10 +21,13 @@ def open_editor(config_path):
         click.echo(click.style('❌ 未找到MC Studio编辑器，请确保已安装MC Studio', fg='red', bold=True))
         return
     
-    cmd_str = f'cmd /c start "MC Studio Editor" "{editor_exe}" "{os.path.abspath(config_path)}"'
-    proc = subprocess.Popen(cmd_str, shell=True)
+    # 直接启动编辑器进程（不经过 cmd /c start），由 SimpleMonitor 直接跟踪该进程，无需扫描进程表
+    proc = subprocess.Popen(
+        [editor_exe, os.path.abspath(config_path)],
+        creationflags=subprocess.CREATE_NEW_CONSOLE
+    )
     
-    return SimpleMonitor("MC_Editor.exe")
+    return SimpleMonitor("MC_Editor.exe", popen=proc)
 
 def create_editor_config(project_name: str, project_dir: str, is_map: bool, addon_paths: list[str]):
     download_path = get_mcs_download_path()
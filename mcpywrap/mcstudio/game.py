@@ -6,8 +6,11 @@ import subprocess
 import click
 import threading
 
-from .mcs import *
+import psutil
+
+from .mcs import _IS_WINDOWS, get_mcs_download_path, get_mcs_game_engine_dirs, get_mcs_install_location
 from .SimpleMonitor import SimpleMonitor
+from ..utils.utils import json_loads
 
 # 添加必要的Windows API支持
 try:
@@ -32,19 +35,21 @@ def open_game(config_path, logging_ip="localhost", logging_port=8678, use_system
     Returns:
         如果 return_process=True，返回进程对象；否则返回布尔值表示是否成功启动
     """
-    if not is_windows():
+    if not _IS_WINDOWS:
         click.secho("❌ 此功能仅支持Windows系统", fg="red", bold=True)
         return False
 
     try:
         # 检查配置文件是否存在
+        # 配置文件的绝对路径只计算一次，后续检查、读取和启动参数都复用
+        config_path = os.path.abspath(config_path)
         if not os.path.isfile(config_path):
             click.secho(f"❌ 配置文件不存在: {config_path}", fg="red", bold=True)
             return False
 
         # 读取配置文件
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
+        with open(config_path, 'rb') as f:
+            config_data = json_loads(f.read())
 
         # 从配置文件中获取目标引擎版本
         target_version = config_data.get("version")
@@ -95,15 +100,16 @@ def open_game(config_path, logging_ip="localhost", logging_port=8678, use_system
 
         click.secho(f"🚀 正在启动游戏...", fg="cyan")
 
-        # 启动游戏程序
-        import subprocess
-
-        # 启动游戏
-        cmd_str = f'cmd /c start "MC Studio Game Console" "{minecraft_exe}" config="{os.path.abspath(config_path)}" loggingIP={logging_ip} loggingPort={logging_port}'
-        proc = subprocess.Popen(cmd_str, shell=True)
+        # 直接以分离进程启动游戏（不经过 cmd /c start），以便保留进程句柄用于事件驱动的等待
+        proc = subprocess.Popen(
+            [minecraft_exe, f"config={config_path}", f"loggingIP={logging_ip}", f"loggingPort={logging_port}"],
+            creationflags=subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP,
+            close_fds=True,
+            cwd=engine_path
+        )
         
         # 如果需要使用系统主题色且Win32API可用，使用定时器异步应用窗口样式
-        if use_system_color and HAS_WIN32API and is_windows():
+        if use_system_color and HAS_WIN32API and _IS_WINDOWS:
             # 使用定时器在5秒后触发窗口样式修改，避免阻塞主线程
             style_timer1 = threading.Timer(5.0, apply_system_titlebar_style, args=["Minecraft"])
             style_timer1.daemon = True
@@ -112,7 +118,7 @@ def open_game(config_path, logging_ip="localhost", logging_port=8678, use_system
             style_timer2.daemon = True
             style_timer2.start()
 
-        return SimpleMonitor("Minecraft.Windows.exe")
+        return SimpleMonitor("Minecraft.Windows.exe", popen=proc)
 
     except json.JSONDecodeError:
         click.secho(f"❌ 配置文件格式错误: {config_path}", fg="red", bold=True)
@@ -224,14 +230,10 @@ def open_safaia():
     Returns:
         bool: 启动成功或已在运行返回 True，否则返回 False
     """
-    if is_windows():
-        # 使用 tasklist 检查 safaia_server.exe 是否已运行
+    if _IS_WINDOWS:
+        # 在进程内检查 safaia_server.exe 是否已运行，避免启动 tasklist 子进程
         try:
-            result = subprocess.run('tasklist /FI "IMAGENAME eq safaia_server.exe" /NH',
-                                    shell=True,
-                                    capture_output=True,
-                                    text=True)
-            if 'safaia_server.exe' in result.stdout:
+            if any(proc.info['name'] == 'safaia_server.exe' for proc in psutil.process_iter(['name'])):
                 click.secho("ℹ️ Safaia Server 已在运行中", fg="blue", bold=True)
                 return True
         except Exception as e:
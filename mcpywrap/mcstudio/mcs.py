@@ -1,11 +1,36 @@
 # -*- coding: utf-8 -*-
 
+import os
+import functools
+
+# 平台在进程生命周期内不会改变，导入时计算一次；其他模块统一从这里导入
+_IS_WINDOWS = os.name == 'nt'
+
+
+def _cache_success(func):
+    """
+    缓存无参查询函数的首个有效结果
+
+    与 functools.lru_cache 不同，结果为 None 或空时不缓存，下次调用重新查询，
+    以便进程运行期间（如 mcpy ui）安装 MC Studio 后能够被发现
+    """
+    result = None
+
+    @functools.wraps(func)
+    def wrapper():
+        nonlocal result
+        if not result:
+            result = func()
+        return result
+
+    return wrapper
+
+
 def is_windows():
     """
     检查是否是Windows系统
     """
-    import os
-    return os.name == 'nt'
+    return _IS_WINDOWS
 
 def get_mcs_version():
     """
@@ -14,7 +39,7 @@ def get_mcs_version():
     Returns:
         str: MCStudio 的版本，如果不存在则返回 None
     """
-    if not is_windows():
+    if not _IS_WINDOWS:
         return None
 
     import winreg
@@ -26,6 +51,7 @@ def get_mcs_version():
     except Exception:
         return None
 
+@_cache_success
 def get_mcs_download_path():
     """
     从注册表中获取 MCStudio 的下载路径
@@ -33,7 +59,7 @@ def get_mcs_download_path():
     Returns:
         str: MCStudio 的下载路径，如果不存在则返回 None
     """
-    if not is_windows():
+    if not _IS_WINDOWS:
         return None
 
     import winreg
@@ -52,7 +78,7 @@ def get_mcs_install_location():
     Returns:
         str: MCStudio 的安装路径，如果不存在则返回 None
     """
-    if not is_windows():
+    if not _IS_WINDOWS:
         return None
 
     import winreg
@@ -74,7 +100,7 @@ def get_mcs_registry_value(value_name):
     Returns:
         任意类型: 键对应的值，如果不存在则返回 None
     """
-    if not is_windows():
+    if not _IS_WINDOWS:
         return None
 
     import winreg
@@ -86,6 +112,7 @@ def get_mcs_registry_value(value_name):
     except Exception:
         return None
 
+@_cache_success
 def get_mcs_game_engine_dirs():
     """
     获取 MCStudio 的游戏引擎目录，并按版本号倒序排序
@@ -94,19 +121,19 @@ def get_mcs_game_engine_dirs():
     过滤掉以 PCLauncher 开头的目录，并按版本号倒序排序（最新版本在前）
 
     Returns:
-        list: 按版本号倒序排序的游戏引擎目录列表，如果路径不存在则返回空列表
+        tuple: 按版本号倒序排序的游戏引擎目录，如果路径不存在则返回空元组
     """
     import os
     from packaging import version
 
     download_path = get_mcs_download_path()
     if not download_path:
-        return []
+        return ()
 
     engine_path = os.path.join(download_path, "game", "MinecraftPE_Netease")
 
     if not os.path.isdir(engine_path):
-        return []
+        return ()
 
     # 获取目录列表并过滤掉PCLauncher开头的目录
     engine_dirs = [
@@ -118,11 +145,13 @@ def get_mcs_game_engine_dirs():
     try:
         # 使用packaging.version进行版本号比较
         sorted_engine_dirs = sorted(engine_dirs, key=lambda x: version.parse(x), reverse=True)
-        return sorted_engine_dirs
     except Exception:
         # 如果解析版本号失败，尝试简单的字符串排序
-        return sorted(engine_dirs, reverse=True)
+        sorted_engine_dirs = sorted(engine_dirs, reverse=True)
+    # 结果会被缓存并在调用方之间共享，返回不可变的元组
+    return tuple(sorted_engine_dirs)
     
+@_cache_success
 def get_mcs_game_engine_data_path():
     """
     获取 MinecraftPE_Netease 用户数据目录
@@ -132,7 +161,7 @@ def get_mcs_game_engine_data_path():
     Returns:
         str: 用户数据目录路径，如果不存在或不是 Windows 系统则返回 None
     """
-    if not is_windows():
+    if not _IS_WINDOWS:
         return None
 
     import os
@@ -153,6 +182,7 @@ def get_mcs_game_engine_data_path():
     except Exception:
         return None
 
+@_cache_success
 def get_mcs_game_engine_netease_data_path():
     """
     获取 MinecraftPE_Netease 用户数据目录
@@ -162,7 +192,7 @@ def get_mcs_game_engine_netease_data_path():
     Returns:
         str: 用户数据目录路径，如果不存在或不是 Windows 系统则返回 None
     """
-    if not is_windows():
+    if not _IS_WINDOWS:
         return None
 
     import os
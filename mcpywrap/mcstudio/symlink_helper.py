@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+辅助创建软链接的脚本 - 以管理员权限运行
+
+常驻运行，通过命名管道逐个接收请求，每个请求为一组链接操作，每个操作为:
+    {"source": 源路径（为None时只删除target处的链接）, "target": 链接路径,
+     "cleanup_first": 创建前是否先删除已有链接, "kind": "dir" 或 "file"}
+每组操作执行完毕后将结果写回管道；收到 {"op": "exit"} 或管道关闭时退出。
+脚本只依赖标准库，全局Addons与地图链接共用
+"""
+
+import os
+import json
+import sys
+import traceback
+from multiprocessing.connection import Client
+
+
+def _apply_op(op):
+    """执行单个链接操作，返回创建的链接路径；只删除链接时返回None"""
+    source = op.get("source")
+    target = op["target"]
+
+    # 只删除链接本身，不删除其指向的内容
+    if (source is None or op.get("cleanup_first")) and os.path.islink(target):
+        os.unlink(target)
+        print(f"已删除现有链接: {target}")
+    if source is None:
+        return None
+
+    # 确保源目录存在
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"源目录不存在: {source}")
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    os.symlink(source, target, target_is_directory=op.get("kind", "dir") == "dir")
+    print(f"链接创建成功: {target}")
+    return target
+
+
+def _handle_request(ops):
+    """执行一组链接操作，单个失败不影响其余操作"""
+    success = True
+    created_links = []
+    errors = []
+
+    for op in ops:
+        try:
+            created = _apply_op(op)
+            if created is not None:
+                created_links.append(created)
+        except Exception as e:
+            error = f"链接操作失败: {op.get('target')} ({str(e)})"
+            print(error)
+            errors.append(error)
+            success = False
+
+    return {
+        "success": success,
+        "created_links": created_links,
+        "errors": errors
+    }
+
+
+def main():
+    """主函数，循环通过命名管道接收链接操作并执行，再将结果写回管道"""
+    # 检查命令行参数
+    if len(sys.argv) != 3:
+        print("参数错误: 需要2个参数 (管道名称, 认证密钥)")
+        sys.exit(1)
+
+    try:
+        conn = Client(sys.argv[1], family="AF_PIPE", authkey=bytes.fromhex(sys.argv[2]))
+    except Exception as e:
+        print(f"无法连接主进程管道: {str(e)}")
+        return 1
+
+    with conn:
+        while True:
+            try:
+                request = json.loads(conn.recv_bytes().decode("utf-8"))
+            except (EOFError, OSError):
+                # 主进程已关闭管道
+                return 0
+
+            if isinstance(request, dict) and request.get("op") == "exit":
+                return 0
+
+            try:
+                result = _handle_request(request)
+            except Exception as e:
+                print(f"执行过程中出错: {str(e)}")
+                print(traceback.format_exc())
+                result = {"success": False, "error": str(e), "traceback": traceback.format_exc()}
+
+            # 将结果写回管道，供主进程读取
+            try:
+                conn.send_bytes(json.dumps(result).encode("utf-8"))
+            except OSError as e:
+                print(f"写入结果失败: {str(e)}")
+                return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,16 +3,18 @@ import click
 import ctypes
 import sys
 import tempfile
-import json
-import base64
-import time
-from .mcs import *
+import functools
+import threading
+import atexit
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from ..utils.utils import json_loads, json_dumps_bytes
+from .mcs import _IS_WINDOWS, get_mcs_game_engine_data_path, get_mcs_game_engine_netease_data_path
+from .winapi import INFINITE
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn, TimeElapsedColumn
 from rich.live import Live
-from rich.panel import Panel
 from rich.text import Text
-from rich.layout import Layout
 
 # 强制请求管理员权限
 FORCE_ADMIN = False
@@ -20,15 +22,271 @@ FORCE_ADMIN = False
 # 创建rich console对象
 console = Console()
 
-# 共享函数定义 - 在 symlink_helper 和 symlinks 中都可以使用
-def create_symlinks(user_data_path, packs):
+# CreateSymbolicLinkW 标志
+SYMBOLIC_LINK_FLAG_DIRECTORY = 0x1
+SYMBOLIC_LINK_FLAG_ALLOW_UNPRIVILEGED_CREATE = 0x2
+
+
+# ShellExecuteExW 相关常量
+SEE_MASK_NOCLOSEPROCESS = 0x00000040
+
+# 等待管理员进程完成的最长时间（毫秒）
+ADMIN_WAIT_TIMEOUT_MS = 30000
+
+
+class SHELLEXECUTEINFOW(ctypes.Structure):
+    """ShellExecuteExW 使用的 SHELLEXECUTEINFOW 结构体"""
+    _fields_ = [
+        ("cbSize", ctypes.c_ulong),
+        ("fMask", ctypes.c_ulong),
+        ("hwnd", ctypes.c_void_p),
+        ("lpVerb", ctypes.c_wchar_p),
+        ("lpFile", ctypes.c_wchar_p),
+        ("lpParameters", ctypes.c_wchar_p),
+        ("lpDirectory", ctypes.c_wchar_p),
+        ("nShow", ctypes.c_int),
+        ("hInstApp", ctypes.c_void_p),
+        ("lpIDList", ctypes.c_void_p),
+        ("lpClass", ctypes.c_wchar_p),
+        ("hkeyClass", ctypes.c_void_p),
+        ("dwHotKey", ctypes.c_ulong),
+        ("hIconOrMonitor", ctypes.c_void_p),
+        ("hProcess", ctypes.c_void_p),
+    ]
+
+
+# AccessCheck 相关常量
+OWNER_SECURITY_INFORMATION = 0x00000001
+GROUP_SECURITY_INFORMATION = 0x00000002
+DACL_SECURITY_INFORMATION = 0x00000004
+TOKEN_DUPLICATE = 0x0002
+TOKEN_QUERY = 0x0008
+SECURITY_IMPERSONATION = 2
+FILE_GENERIC_READ = 0x00120089
+FILE_GENERIC_WRITE = 0x00120116
+FILE_GENERIC_EXECUTE = 0x001200A0
+FILE_ALL_ACCESS = 0x001F01FF
+
+
+class GENERIC_MAPPING(ctypes.Structure):
+    """AccessCheck 使用的 GENERIC_MAPPING 结构体"""
+    _fields_ = [
+        ("GenericRead", ctypes.c_ulong),
+        ("GenericWrite", ctypes.c_ulong),
+        ("GenericExecute", ctypes.c_ulong),
+        ("GenericAll", ctypes.c_ulong),
+    ]
+
+
+# Windows API 绑定，导入时解析一次并声明参数类型，调用时无需再经由 ctypes.windll 逐级查找
+if _IS_WINDOWS:
+    from ctypes import wintypes
+
+    # kernel32 以及 WaitForSingleObject / CloseHandle 与 SimpleMonitor 共用 winapi 中的绑定
+    from .winapi import kernel32 as _kernel32, WaitForSingleObject as _WaitForSingleObject, CloseHandle as _CloseHandle
+
+    _shell32 = ctypes.WinDLL("shell32", use_last_error=True)
+    _advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
+
+    _IsUserAnAdmin = _shell32.IsUserAnAdmin
+    _IsUserAnAdmin.argtypes = []
+    _IsUserAnAdmin.restype = wintypes.BOOL
+
+    _ShellExecuteExW = _shell32.ShellExecuteExW
+    _ShellExecuteExW.argtypes = [ctypes.POINTER(SHELLEXECUTEINFOW)]
+    _ShellExecuteExW.restype = wintypes.BOOL
+
+    _CreateSymbolicLinkW = _kernel32.CreateSymbolicLinkW
+    _CreateSymbolicLinkW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD]
+    _CreateSymbolicLinkW.restype = ctypes.c_ubyte
+
+    _GetExitCodeProcess = _kernel32.GetExitCodeProcess
+    _GetExitCodeProcess.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD)]
+    _GetExitCodeProcess.restype = wintypes.BOOL
+
+    _GetCurrentProcess = _kernel32.GetCurrentProcess
+    _GetCurrentProcess.argtypes = []
+    _GetCurrentProcess.restype = wintypes.HANDLE
+
+    _GetFileSecurityW = _advapi32.GetFileSecurityW
+    _GetFileSecurityW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD, ctypes.c_void_p, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD)]
+    _GetFileSecurityW.restype = wintypes.BOOL
+
+    _OpenProcessToken = _advapi32.OpenProcessToken
+    _OpenProcessToken.argtypes = [wintypes.HANDLE, wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE)]
+    _OpenProcessToken.restype = wintypes.BOOL
+
+    _DuplicateToken = _advapi32.DuplicateToken
+    _DuplicateToken.argtypes = [wintypes.HANDLE, ctypes.c_int, ctypes.POINTER(wintypes.HANDLE)]
+    _DuplicateToken.restype = wintypes.BOOL
+
+    _AccessCheck = _advapi32.AccessCheck
+    _AccessCheck.argtypes = [
+        ctypes.c_void_p, wintypes.HANDLE, wintypes.DWORD, ctypes.POINTER(GENERIC_MAPPING),
+        ctypes.c_void_p, ctypes.POINTER(wintypes.DWORD), ctypes.POINTER(wintypes.DWORD), ctypes.POINTER(wintypes.BOOL)
+    ]
+    _AccessCheck.restype = wintypes.BOOL
+
+
+def _create_dir_symlink(target, link_path):
+    """
+    创建指向目录的软链接
+
+    Python 3.8+ 的 os.symlink 在 Windows 下会直接调用 CreateSymbolicLinkW 并自动附带
+    ALLOW_UNPRIVILEGED_CREATE 标志（开启开发者模式时无需管理员权限），指定 target_is_directory
+    后也不再探测目标类型；更早的版本则通过 ctypes 直接调用 CreateSymbolicLinkW
+    """
+    if not _IS_WINDOWS or sys.version_info >= (3, 8):
+        os.symlink(target, link_path, target_is_directory=True)
+        return
+    flags = SYMBOLIC_LINK_FLAG_DIRECTORY | SYMBOLIC_LINK_FLAG_ALLOW_UNPRIVILEGED_CREATE
+    if not _CreateSymbolicLinkW(link_path, target, flags):
+        raise ctypes.WinError(ctypes.get_last_error())
+
+
+def _normalize_link_target(path):
+    """规范化链接目标路径，便于比较（去除Windows的 \\\\?\\ 前缀并统一大小写）"""
+    if path.startswith('\\\\?\\'):
+        path = path[4:]
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _print_lines(lines):
+    """将多行带样式的输出合并为一次打印，避免逐行写入控制台；lines 为 [(文本, 样式)]"""
+    if not lines:
+        return
+    text = Text("\n").join(Text(line, style=style) for line, style in lines)
+    console.print(text)
+
+
+def _diff_directory_symlinks(directory, desired):
+    """
+    比较目录下现有的软链接与期望的链接，只做 scandir 与 readlink，不写入任何内容
+
+    Args:
+        directory: 链接所在目录，不存在时视为没有任何链接
+        desired: 期望的链接，{链接名称: 目标路径}
+
+    Returns:
+        tuple: (需要删除的链接名称列表, 已指向正确目标的链接名称集合)
+    """
+    stale = []
+    kept = set()
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if not entry.is_symlink():
+                    continue
+                target = desired.get(entry.name)
+                if target is not None:
+                    try:
+                        if _normalize_link_target(os.readlink(entry.path)) == _normalize_link_target(target):
+                            kept.add(entry.name)
+                            continue
+                    except OSError:
+                        pass
+                stale.append(entry.name)
+    except FileNotFoundError:
+        pass
+    return stale, kept
+
+
+def _clear_directory_symlinks(directory, keep=None, on_unlink=None):
+    """
+    删除目录下的软链接，只删除链接本身而不删除其指向的内容
+
+    Args:
+        directory: 要清理的目录，不存在时直接返回
+        keep: 需要保留的链接，{链接名称: 目标路径}；名称与目标均一致的链接不会被删除
+        on_unlink: 删除每个链接前调用的回调，参数为链接名称
+
+    Returns:
+        tuple: (删除的链接数量, 保留的链接名称集合)
+    """
+    stale, kept = _diff_directory_symlinks(directory, keep or {})
+    link_count = 0
+    for name in stale:
+        if on_unlink:
+            on_unlink(name)
+        try:
+            os.unlink(f"{directory}{os.sep}{name}")
+            link_count += 1
+        except Exception as e:
+            console.print(f"⚠️ 删除链接失败 {name}: {str(e)}", style="yellow")
+    return link_count, kept
+
+
+def _norm_pack(pack):
+    """将不同格式的pack对象统一为 (行为包目录, 资源包目录, 包名) 元组"""
+    try:
+        return pack.behavior_pack_dir, pack.resource_pack_dir, pack.pkg_name
+    except AttributeError:
+        # 字典格式
+        return pack.get("behavior_pack_dir"), pack.get("resource_pack_dir"), pack.get("pkg_name", "unknown")
+
+
+def _collect_pack_links(packs):
+    """
+    收集所有在磁盘上存在的包目录及其链接名称，每个包目录只检查一次
+
+    Returns:
+        list: [(包目录, 链接名称, 类型, 显示名称, 包名)]
+    """
+    return [
+        (pack_dir, f"{os.path.basename(pack_dir)}_{pkg_name}", kind, label, pkg_name)
+        for behavior_pack_dir, resource_pack_dir, pkg_name in map(_norm_pack, packs)
+        for pack_dir, kind, label in (
+            (behavior_pack_dir, "behavior", "行为包"),
+            (resource_pack_dir, "resource", "资源包"),
+        )
+        if pack_dir and os.path.isdir(pack_dir)
+    ]
+
+
+def _plan_addon_links(user_data_path, pack_links):
+    """
+    计算需要在用户数据目录下存在的全部Addons链接
+
+    Args:
+        user_data_path: MC Studio用户数据目录
+        pack_links: _collect_pack_links 的结果
+
+    Returns:
+        tuple: (链接任务列表 [(包目录, 链接所在目录, 链接名称, 链接路径, 类型, 显示名称, 包名)],
+                期望的链接 {链接所在目录: {链接名称: 包目录}})
+    """
+    packs_dirs = {
+        "behavior": os.path.join(user_data_path, "behavior_packs"),
+        "resource": os.path.join(user_data_path, "resource_packs"),
+    }
+    # 链接所在目录不以分隔符结尾，直接拼接即可得到链接路径，只需计算一次
+    link_tasks = [
+        (pack_dir, packs_dirs[kind], link_name, f"{packs_dirs[kind]}{os.sep}{link_name}", kind, label, pkg_name)
+        for pack_dir, link_name, kind, label, pkg_name in pack_links
+    ]
+    desired_links = {packs_dir: {} for packs_dir in packs_dirs.values()}
+    for pack_dir, packs_dir, link_name, _, _, _, _ in link_tasks:
+        desired_links[packs_dir][link_name] = pack_dir
+    return link_tasks, desired_links
+
+
+def _addon_links_up_to_date(desired_links):
+    """检查现有链接是否与期望完全一致：没有多余的链接，且每个期望的链接都已指向正确的目标"""
+    for directory, desired in desired_links.items():
+        stale, kept = _diff_directory_symlinks(directory, desired)
+        if stale or len(kept) != len(desired):
+            return False
+    return True
+
+
+def create_symlinks(user_data_path, packs, pack_links=None):
     """
     在指定目录下为行为包和资源包创建软链接
     
     Args:
         user_data_path: MC Studio用户数据目录
         packs: 行为包和资源包列表
-        use_click: 是否使用click库进行输出，子进程中会设置为False
+        pack_links: 已收集好的包目录信息（_collect_pack_links 的结果），为None时重新收集
         
     Returns:
         tuple: (成功状态, 行为包链接列表, 资源包链接列表)
@@ -36,41 +294,30 @@ def create_symlinks(user_data_path, packs):
     behavior_links = []
     resource_links = []
 
-    # 行为包和资源包目录
-    behavior_packs_dir = os.path.join(user_data_path, "behavior_packs")
-    resource_packs_dir = os.path.join(user_data_path, "resource_packs")
-
-    # 确保目录存在
-    os.makedirs(behavior_packs_dir, exist_ok=True)
-    os.makedirs(resource_packs_dir, exist_ok=True)
-
     # 用于跟踪统计信息
     total_deleted = 0
     success_count = 0
     fail_count = 0
-    
-    # 处理包数据格式的统一转换函数
-    def get_pack_data(pack):
-        """从不同格式的pack对象中提取数据"""
-        if isinstance(pack, dict):
-            # 如果是字典格式，直接使用
-            return {
-                "behavior_pack_dir": pack.get("behavior_pack_dir"),
-                "resource_pack_dir": pack.get("resource_pack_dir"),
-                "pkg_name": pack.get("pkg_name")
-            }
-        else:
-            # 如果是对象格式，从属性中获取
-            return {
-                "behavior_pack_dir": getattr(pack, "behavior_pack_dir", None),
-                "resource_pack_dir": getattr(pack, "resource_pack_dir", None),
-                "pkg_name": getattr(pack, "pkg_name", "unknown")
-            }
+
+    if pack_links is None:
+        pack_links = _collect_pack_links(packs)
+    link_tasks, desired_links = _plan_addon_links(user_data_path, pack_links)
+    links_by_kind = {"behavior": behavior_links, "resource": resource_links}
+
+    # 行为包和资源包目录，两者的清理流程完全相同，按表处理
+    packs_dirs = (
+        (os.path.join(user_data_path, "behavior_packs"), "行为包"),
+        (os.path.join(user_data_path, "resource_packs"), "资源包"),
+    )
+
+    # 确保目录存在
+    for packs_dir, _ in packs_dirs:
+        os.makedirs(packs_dir, exist_ok=True)
 
     # 使用单一Live组件处理整个过程
     with Live(console=console, refresh_per_second=10) as live:
-        # 第一阶段：清理现有链接
-        live.update(Text("🧹 清理现有软链接...", style="cyan"))
+        # 第一阶段：清理过期链接，已指向正确目标的链接原样保留
+        live.update(Text("🧹 清理过期软链接...", style="cyan"))
 
         # 使用Progress组件显示清理过程
         progress = Progress(
@@ -88,40 +335,22 @@ def create_symlinks(user_data_path, packs):
         # 更新Live显示当前进度
         live.update(progress)
 
-        # 清理行为包目录
-        if os.path.exists(behavior_packs_dir):
-            link_count = 0
-            for item in os.listdir(behavior_packs_dir):
-                item_path = os.path.join(behavior_packs_dir, item)
-                if os.path.islink(item_path):
-                    progress.update(clean_task, description=f"删除行为包链接 {item}")
-                    try:
-                        os.unlink(item_path)
-                        link_count += 1
-                    except Exception as e:
-                        console.print(f"⚠️ 删除链接失败 {item}: {str(e)}", style="yellow")
-            
+        # 依次清理行为包和资源包目录
+        kept_links = {}
+        for packs_dir, label in packs_dirs:
+            link_count, kept_links[packs_dir] = _clear_directory_symlinks(
+                packs_dir,
+                desired_links[packs_dir],
+                lambda name, label=label: progress.update(clean_task, description=f"删除{label}链接 {name}")
+            )
             total_deleted += link_count
-            progress.update(clean_task, description=f"已删除 {link_count} 个行为包链接")
-            
-        # 清理资源包目录
-        if os.path.exists(resource_packs_dir):
-            link_count = 0
-            for item in os.listdir(resource_packs_dir):
-                item_path = os.path.join(resource_packs_dir, item)
-                if os.path.islink(item_path):
-                    progress.update(clean_task, description=f"删除资源包链接 {item}")
-                    try:
-                        os.unlink(item_path)
-                        link_count += 1
-                    except Exception as e:
-                        console.print(f"⚠️ 删除链接失败 {item}: {str(e)}", style="yellow")
-            
-            total_deleted += link_count
-            progress.update(clean_task, description=f"清理完成")
-            progress.stop()
+            progress.update(clean_task, description=f"已删除 {link_count} 个{label}链接")
+        progress.update(clean_task, description=f"清理完成")
+        progress.stop()
+
+        kept_count = sum(len(kept) for kept in kept_links.values())
         
-        # 第二阶段：创建新链接
+        # 第二阶段：创建缺失的链接
         live.update(Text("🔗 创建新的软链接...", style="cyan"))
         
         # 新的Progress组件用于创建链接
@@ -134,78 +363,57 @@ def create_symlinks(user_data_path, packs):
             expand=True
         )
         
-        # 计算总任务数（行为包和资源包）
-        total_tasks = 0
-        for pack in packs:
-            pack_data = get_pack_data(pack)
-            if pack_data["behavior_pack_dir"] and os.path.exists(pack_data["behavior_pack_dir"]):
-                total_tasks += 1
-            if pack_data["resource_pack_dir"] and os.path.exists(pack_data["resource_pack_dir"]):
-                total_tasks += 1
-        
-        link_task = progress.add_task("创建软链接", total=total_tasks)
+        link_task = progress.add_task("创建软链接", total=len(link_tasks))
         live.update(progress)
         
-        # 处理所有包
-        for i, pack in enumerate(packs):
-            pack_data = get_pack_data(pack)
-            
-            # 处理行为包
-            if pack_data["behavior_pack_dir"] and os.path.exists(pack_data["behavior_pack_dir"]):
-                link_name = f"{os.path.basename(pack_data['behavior_pack_dir'])}_{pack_data['pkg_name']}"
-                link_path = os.path.join(behavior_packs_dir, link_name)
-                
-                progress.update(link_task, description=f"创建行为包链接: {pack_data['pkg_name']}")
+        # 各链接的创建互不相关，使用线程池并发创建；结果按原顺序收集，最后统一输出
+        report = []
+        if link_tasks:
+            with ThreadPoolExecutor(max_workers=min(16, len(link_tasks))) as executor:
+                futures = [
+                    None if link_name in kept_links[packs_dir]
+                    else executor.submit(_create_dir_symlink, pack_dir, link_path)
+                    for pack_dir, packs_dir, link_name, link_path, _, _, _ in link_tasks
+                ]
+                for (pack_dir, packs_dir, link_name, link_path, kind, label, pkg_name), future in zip(link_tasks, futures):
+                    links = links_by_kind[kind]
+                    # 已存在且指向正确的链接直接复用
+                    if future is None:
+                        links.append(link_name)
+                        progress.advance(link_task)
+                        continue
 
-                try:
-                    os.symlink(pack_data["behavior_pack_dir"], link_path)
-                    behavior_links.append(link_name)
-                    success_count += 1
-                    # 简洁输出链接路径信息 - 源路径指向链接完整路径
-                    source_path = pack_data['behavior_pack_dir'].replace('\\', '/')
-                    link_full_path = link_path.replace('\\', '/')
-                    console.print(f"  ✓ {source_path} → {link_full_path}", style="green")
-                except Exception as e:
-                    console.print(f"⚠️ 创建失败: {link_name} ({str(e)})", style="yellow")
-                    fail_count += 1
-                
-                progress.advance(link_task)
-
-            # 处理资源包
-            if pack_data["resource_pack_dir"] and os.path.exists(pack_data["resource_pack_dir"]):
-                link_name = f"{os.path.basename(pack_data['resource_pack_dir'])}_{pack_data['pkg_name']}"
-                link_path = os.path.join(resource_packs_dir, link_name)
-                
-                progress.update(link_task, description=f"创建资源包链接: {pack_data['pkg_name']}")
-
-                try:
-                    os.symlink(pack_data["resource_pack_dir"], link_path)
-                    resource_links.append(link_name)
-                    success_count += 1
-                    # 简洁输出链接路径信息 - 源路径指向链接完整路径
-                    source_path = pack_data['resource_pack_dir'].replace('\\', '/')
-                    link_full_path = link_path.replace('\\', '/')
-                    console.print(f"  ✓ {source_path} → {link_full_path}", style="green")
-                except Exception as e:
-                    console.print(f"⚠️ 创建失败: {link_name} ({str(e)})", style="yellow")
-                    fail_count += 1
-                
-                progress.advance(link_task)
+                    progress.update(link_task, description=f"创建{label}链接: {pkg_name}")
+                    try:
+                        future.result()
+                        links.append(link_name)
+                        success_count += 1
+                        # 简洁输出链接路径信息 - 源路径指向链接完整路径
+                        source_path = pack_dir.replace('\\', '/')
+                        link_full_path = link_path.replace('\\', '/')
+                        report.append((f"  ✓ {source_path} → {link_full_path}", "green"))
+                    except Exception as e:
+                        report.append((f"⚠️ 创建失败: {link_name} ({str(e)})", "yellow"))
+                        fail_count += 1
+                    
+                    progress.advance(link_task)
                 
-        # 停止进度条
+        # 停止进度条，并一次性输出各链接的创建结果
         progress.stop()
+        _print_lines(report)
         
         # 输出最终结果（这是唯一保留在控制台上的输出）
         if fail_count == 0:
-            result = Text(f"✅ Addons链接设置完成: 清理了 {total_deleted} 个旧链接，创建了 {success_count} 个新链接", style="green")
+            result = Text(f"✅ Addons链接设置完成: 清理了 {total_deleted} 个旧链接，保留 {kept_count} 个，创建了 {success_count} 个新链接", style="green")
         else:
-            result = Text(f"⚠️ Addons链接部分完成: 清理了 {total_deleted} 个旧链接，成功 {success_count} 个，失败 {fail_count} 个", style="yellow")
+            result = Text(f"⚠️ Addons链接部分完成: 清理了 {total_deleted} 个旧链接，保留 {kept_count} 个，成功 {success_count} 个，失败 {fail_count} 个", style="yellow")
         
         live.update(result)
     
     return fail_count == 0, behavior_links, resource_links
 
 
+@functools.lru_cache(maxsize=1)
 def is_admin():
     """
     检查当前程序是否以管理员权限运行
@@ -214,27 +422,283 @@ def is_admin():
         bool: 是否具有管理员权限
     """
     try:
-        return ctypes.windll.shell32.IsUserAnAdmin() != 0
+        return _IsUserAnAdmin() != 0
     except:
         return False
 
 
-def has_write_permission(path):
+def _shell_execute_as_admin(params):
+    """
+    以管理员权限启动Python脚本，不等待其结束
+
+    Args:
+        params: 传递给Python解释器的命令行参数
+
+    Returns:
+        提权进程的句柄；提权失败（如用户拒绝）返回None
+    """
+    sei = SHELLEXECUTEINFOW()
+    sei.cbSize = ctypes.sizeof(SHELLEXECUTEINFOW)
+    sei.fMask = SEE_MASK_NOCLOSEPROCESS
+    sei.lpVerb = "runas"
+    sei.lpFile = sys.executable
+    sei.lpParameters = params
+    sei.nShow = 0
+
+    if not _ShellExecuteExW(ctypes.byref(sei)) or not sei.hProcess:
+        return None
+    return sei.hProcess
+
+
+class _ElevatedHelper:
+    """
+    以管理员权限常驻的辅助进程
+
+    首次需要提权时启动 symlink_helper.py，之后同一会话中的链接操作都经由命名管道发送给该进程，
+    整个会话只需一次UAC提权；本进程退出时通过 atexit 通知辅助进程结束
+    """
+
+    def __init__(self):
+        self._conn = None
+        self._lock = threading.Lock()
+        self.exit_code = None
+
+    @property
+    def running(self):
+        """辅助进程是否已启动并连接"""
+        return self._conn is not None
+
+    def _start(self, script_path, timeout_ms):
+        """启动辅助进程并等待其连接管道，返回是否提权成功"""
+        from multiprocessing.connection import Listener, Client
+
+        address = rf"\\.\pipe\mcpywrap-{os.getpid()}-{uuid.uuid4().hex}"
+        authkey = os.urandom(16)
+        listener = Listener(address, family="AF_PIPE", authkey=authkey)
+        state = {"conn": None, "abandoned": False}
+
+        def serve():
+            try:
+                conn = listener.accept()
+            except (OSError, EOFError):
+                return
+            if state["abandoned"]:
+                conn.close()
+            else:
+                state["conn"] = conn
+
+        def unblock():
+            # 放弃等待时自行连接一次以结束阻塞的 accept；在后台进行，关闭监听后即失败返回
+            state["abandoned"] = True
+
+            def connect():
+                try:
+                    Client(address, family="AF_PIPE", authkey=authkey).close()
+                except (OSError, EOFError):
+                    pass
+
+            threading.Thread(target=connect, daemon=True).start()
+
+        server = threading.Thread(target=serve, daemon=True)
+        server.start()
+        try:
+            # 辅助脚本只依赖标准库，使用 -S 跳过 site 的初始化以加快提权子进程的启动
+            handle = _shell_execute_as_admin(f'-S "{script_path}" "{address}" {authkey.hex()}')
+            if handle is not None:
+                self.exit_code = None
+
+                def watch():
+                    # 辅助进程退出时记录退出码，并结束仍在等待的 accept
+                    _WaitForSingleObject(handle, INFINITE)
+                    exit_code = wintypes.DWORD()
+                    if _GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                        self.exit_code = exit_code.value
+                    _CloseHandle(handle)
+                    if server.is_alive():
+                        unblock()
+
+                threading.Thread(target=watch, daemon=True).start()
+                server.join(timeout_ms / 1000)
+            if server.is_alive():
+                unblock()
+                server.join(1)
+        finally:
+            listener.close()
+
+        self._conn = state["conn"]
+        if self._conn is not None:
+            atexit.register(self.close)
+        return handle is not None
+
+    def request(self, script_path, ops, timeout_ms=ADMIN_WAIT_TIMEOUT_MS):
+        """
+        将一组链接操作发送给辅助进程并等待结果，必要时先启动辅助进程
+
+        Returns:
+            tuple: (操作是否在超时前完成（提权失败时为None）, 辅助进程返回的结果（未返回时为None）)
+        """
+        with self._lock:
+            if self._conn is None and not self._start(script_path, timeout_ms):
+                return None, None
+            if self._conn is not None:
+                try:
+                    self._conn.send_bytes(json_dumps_bytes(ops))
+                    if not self._conn.poll(timeout_ms / 1000):
+                        # 辅助进程未在规定时间内完成，放弃该进程，下次重新启动
+                        self.close()
+                        return False, None
+                    return True, json_loads(self._conn.recv_bytes())
+                except (OSError, EOFError, ValueError):
+                    self.close()
+
+            # 辅助进程未连接或中途退出时，根据退出码构造失败结果
+            if self.exit_code:
+                return True, {"success": False, "errors": [f"管理员进程异常退出（退出码 {self.exit_code}）"]}
+            return self.exit_code is not None, None
+
+    def close(self):
+        """通知辅助进程结束并关闭管道"""
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            conn.send_bytes(json_dumps_bytes({"op": "exit"}))
+        except OSError:
+            pass
+        conn.close()
+
+
+# 会话内共用的管理员辅助进程
+_elevated_helper = _ElevatedHelper()
+
+
+@functools.lru_cache(maxsize=1)
+def _can_create_symlink_unprivileged():
+    """
+    检查当前进程能否直接创建软链接（管理员，或已开启开发者模式 / 拥有 SeCreateSymbolicLinkPrivilege）
+
+    在临时目录中探测一次，结果在进程生命周期内缓存
+
+    Returns:
+        bool: 是否能够创建软链接
+    """
+    try:
+        probe_dir = tempfile.mkdtemp(prefix="mcpywrap_symlink_")
+    except OSError:
+        return False
+    probe_target = os.path.join(probe_dir, "target")
+    probe_link = os.path.join(probe_dir, "link")
+    try:
+        os.mkdir(probe_target)
+        _create_dir_symlink(probe_target, probe_link)
+        return True
+    except OSError:
+        return False
+    finally:
+        # 清理探测用的临时文件
+        try:
+            if os.path.islink(probe_link):
+                os.unlink(probe_link)
+            if os.path.isdir(probe_target):
+                os.rmdir(probe_target)
+            os.rmdir(probe_dir)
+        except OSError:
+            pass
+
+
+def _needs_elevation(*paths):
+    """
+    判断在指定目录下创建软链接是否需要提权
+
+    已是管理员时无需提权；无法创建软链接时（未开启开发者模式）直接判定需要提权，
+    省去在各目录中的探测
+    """
+    if FORCE_ADMIN:
+        return True
+    if is_admin():
+        return False
+    if not _can_create_symlink_unprivileged():
+        return True
+    return not all(has_write_permission(path) for path in paths)
+
+
+def _check_write_access(path):
+    """
+    通过目录的安全描述符判断当前用户是否拥有写入权限
+
+    使用 GetFileSecurityW + AccessCheck 在内存中完成判断，不会在目录中创建任何文件
+
+    Returns:
+        bool: 是否拥有写入权限；无法查询（如文件系统不支持ACL）时返回None
+    """
+    # 获取目录的安全描述符，先查询所需的缓冲区大小
+    info = OWNER_SECURITY_INFORMATION | GROUP_SECURITY_INFORMATION | DACL_SECURITY_INFORMATION
+    needed = wintypes.DWORD(0)
+    _GetFileSecurityW(path, info, None, 0, ctypes.byref(needed))
+    if not needed.value:
+        return None
+    security_descriptor = ctypes.create_string_buffer(needed.value)
+    if not _GetFileSecurityW(path, info, security_descriptor, needed, ctypes.byref(needed)):
+        return None
+
+    # AccessCheck 需要模拟令牌，复制一份当前进程的令牌
+    token = wintypes.HANDLE()
+    if not _OpenProcessToken(_GetCurrentProcess(), TOKEN_QUERY | TOKEN_DUPLICATE, ctypes.byref(token)):
+        return None
+    try:
+        impersonation_token = wintypes.HANDLE()
+        if not _DuplicateToken(token, SECURITY_IMPERSONATION, ctypes.byref(impersonation_token)):
+            return None
+        try:
+            mapping = GENERIC_MAPPING(FILE_GENERIC_READ, FILE_GENERIC_WRITE, FILE_GENERIC_EXECUTE, FILE_ALL_ACCESS)
+            privilege_set = ctypes.create_string_buffer(256)
+            privilege_set_length = wintypes.DWORD(ctypes.sizeof(privilege_set))
+            granted_access = wintypes.DWORD(0)
+            access_status = wintypes.BOOL(False)
+            if not _AccessCheck(
+                security_descriptor, impersonation_token, FILE_GENERIC_WRITE, ctypes.byref(mapping),
+                privilege_set, ctypes.byref(privilege_set_length),
+                ctypes.byref(granted_access), ctypes.byref(access_status)
+            ):
+                return None
+            return bool(access_status.value) and (granted_access.value & FILE_GENERIC_WRITE) == FILE_GENERIC_WRITE
+        finally:
+            _CloseHandle(impersonation_token)
+    finally:
+        _CloseHandle(token)
+
+
+def has_write_permission(path, strict=False):
     """
     检查是否有对指定路径创建软链接的权限
 
+    默认只做只读查询：Windows 下通过 AccessCheck 查询目录的写入权限，其他情况使用 os.access，
+    并结合进程级的软链接创建能力判断；strict 为True时在目录中实际创建测试链接
+
     Args:
         path: 要检查的路径
+        strict: 是否通过实际创建测试链接来检查
 
     Returns:
         bool: 是否有创建软链接的权限
     """
-    if not os.path.exists(path):
+    if not os.path.isdir(path):
         try:
             os.makedirs(path, exist_ok=True)
-        except:
+        except OSError:
             return False
-    
+
+    if strict:
+        return _probe_symlink_permission(path)
+
+    writable = _check_write_access(path) if _IS_WINDOWS else None
+    if writable is None:
+        writable = os.access(path, os.W_OK)
+    return writable and _can_create_symlink_unprivileged()
+
+
+def _probe_symlink_permission(path):
+    """在目录中实际创建并删除一个测试链接，判断是否有创建软链接的权限"""
     # 创建一个测试目录和一个测试链接的目标
     test_dir = os.path.join(path, '.symlink_test_dir')
     test_link = os.path.join(path, '.symlink_test')
@@ -250,8 +714,8 @@ def has_write_permission(path):
             else:
                 os.remove(test_link)
         
-        # 尝试创建一个软链接
-        os.symlink(test_dir, test_link)
+        # 尝试以与实际创建链接相同的方式创建一个目录软链接（开发者模式下无需管理员权限）
+        _create_dir_symlink(test_dir, test_link)
         
         # 验证链接是否成功创建
         has_permission = os.path.islink(test_link)
@@ -286,80 +750,112 @@ def has_write_permission(path):
         return False
 
 
-def admin_global_link(script_path, packs_data, user_data_path):
+@functools.lru_cache(maxsize=1)
+def _helper_script_path():
     """
-    以管理员权限运行脚本
+    获取管理员辅助脚本的路径
+
+    首次调用时将 symlink_helper.py 以 optimize=2 编译为字节码缓存，之后直接运行 .pyc，
+    省去提权子进程中的源码解析；缓存不可写时退回到源码文件。脚本不存在时返回None
+    """
+    import importlib.util
+    import py_compile
+
+    script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "symlink_helper.py")
+    if not os.path.exists(script_path):
+        return None
+    cache_path = importlib.util.cache_from_source(script_path, optimization=2)
+    try:
+        if not os.path.exists(cache_path) or os.path.getmtime(cache_path) < os.path.getmtime(script_path):
+            py_compile.compile(script_path, cfile=cache_path, doraise=True, optimize=2)
+        return cache_path
+    except (OSError, py_compile.PyCompileError):
+        return script_path
+
+
+def _run_link_ops_as_admin(ops, scope):
+    """
+    以管理员权限运行辅助脚本执行一组链接操作（全局Addons与地图链接共用同一个辅助脚本）
+
+    Args:
+        ops: 链接操作列表，格式见 symlink_helper.py
+        scope: 用于提示信息的链接范围名称
+
+    Returns:
+        dict: 辅助脚本返回的结果；提权失败、超时或未返回结果时返回None
+    """
+    # 获取辅助脚本路径
+    script_path = _helper_script_path()
+    if script_path is None:
+        console.print("⚠️ 辅助脚本不存在: symlink_helper.py", style="yellow")
+        return None
+
+    # 执行提权操作；本会话中已提权过时直接复用常驻的管理员进程
+    if not _elevated_helper.running:
+        console.print(f"🔒 需要管理员权限创建[{scope}]软链接，正在提权...", style="yellow")
+
+    # 链接操作经由管道发送给管理员进程，并等待其返回结果
+    with console.status("等待管理员进程完成...", spinner="dots"):
+        finished, result_data = _elevated_helper.request(script_path, ops)
+
+    if finished is None:
+        console.print("❌ 提权失败，无法创建软链接", style="red")
+        return None
+
+    if not finished:
+        console.print("⚠️ 管理员进程未在规定时间内完成", style="yellow")
+        return None
+
+    if result_data is None:
+        console.print("⚠️ 管理员进程未返回结果", style="yellow")
+        return None
+
+    return result_data
+
+
+def admin_global_link(link_tasks, desired_links):
+    """
+    以管理员权限删除过期的Addons链接并创建缺失的链接
     
     Args:
-        script_path: 脚本路径
-        packs_data: 包数据
-        user_data_path: 用户数据路径
+        link_tasks: 链接任务列表（_plan_addon_links 的结果）
+        desired_links: 期望的链接 {链接所在目录: {链接名称: 包目录}}
         
     Returns:
         tuple: (成功状态, 行为包链接列表, 资源包链接列表)
     """
     try:
-        # 创建临时结果文件
-        result_file = tempfile.mktemp(suffix='.json')
-        
-        # 将数据编码为Base64
-        encoded_packs = base64.b64encode(json.dumps(packs_data).encode('utf-8')).decode('utf-8')
-        encoded_path = base64.b64encode(json.dumps(user_data_path).encode('utf-8')).decode('utf-8')
-        encoded_result = base64.b64encode(result_file.encode('utf-8')).decode('utf-8')
-        
-        # 构建命令行参数
-        params = f'"{script_path}" {encoded_packs} {encoded_path} {encoded_result}'
-        
-        # 执行提权操作
-        console.print("🔒 需要管理员权限创建[全局]软链接，正在提权...", style="yellow")
-        shellExecute = ctypes.windll.shell32.ShellExecuteW
-        result = shellExecute(None, "runas", sys.executable, params, None, 0)
-        
-        if result <= 32:  # ShellExecute返回值小于等于32表示失败
-            console.print("❌ 提权失败，无法创建软链接", style="red")
+        # 在本进程中比较现有链接，只把需要删除和创建的链接交给管理员进程
+        ops = []
+        kept_links = {}
+        for directory, desired in desired_links.items():
+            stale, kept = _diff_directory_symlinks(directory, desired)
+            kept_links[directory] = kept
+            ops.extend({"source": None, "target": os.path.join(directory, name)} for name in stale)
+        ops.extend(
+            {"source": pack_dir, "target": link_path, "cleanup_first": True}
+            for pack_dir, packs_dir, link_name, link_path, _, _, _ in link_tasks
+            if link_name not in kept_links[packs_dir]
+        )
+
+        result_data = _run_link_ops_as_admin(ops, "全局")
+        if result_data is None:
             return False, [], []
         
-        # 使用Live显示等待过程
-        with Live("等待管理员进程完成...", console=console, refresh_per_second=4) as live:
-            max_wait_time = 30  # 最多等待30秒
-            start_time = time.time()
-            
-            while time.time() - start_time < max_wait_time:
-                elapsed = time.time() - start_time
-                live.update(Text(f"等待管理员进程完成... ({elapsed:.1f}秒)", style="yellow"))
-                
-                if os.path.exists(result_file):
-                    try:
-                        with open(result_file, 'r') as f:
-                            result_data = json.load(f)
-                        
-                        # 删除临时文件
-                        try:
-                            os.remove(result_file)
-                        except:
-                            pass
-                        
-                        success = result_data.get("success", False)
-                        behavior_links = result_data.get("behavior_links", [])
-                        resource_links = result_data.get("resource_links", [])
-                        
-                        if success:
-                            live.update(Text("✅ 管理员进程成功完成", style="green"))
-                        else:
-                            live.update(Text("⚠️ 管理员进程执行遇到问题", style="yellow"))
-                        
-                        return success, behavior_links, resource_links
-                    except Exception:
-                        # 文件可能还在写入，等待一下再试
-                        pass
-                
-                # 短暂休眠避免CPU占用过高
-                time.sleep(0.1)
-            
-            live.update(Text("⚠️ 等待管理员进程超时", style="yellow"))
+        success = result_data.get("success", False)
+        created = set(result_data.get("created_links", []))
+        links = {"behavior": [], "resource": []}
+        for _, packs_dir, link_name, link_path, kind, _, _ in link_tasks:
+            if link_name in kept_links[packs_dir] or link_path in created:
+                links[kind].append(link_name)
         
-        console.print("⚠️ 等待操作完成超时", style="yellow")
-        return False, [], []
+        if success:
+            console.print("✅ 管理员进程成功完成", style="green")
+        else:
+            console.print("⚠️ 管理员进程执行遇到问题", style="yellow")
+            _print_lines([(f"  ✗ {err}", "red") for err in result_data.get("errors", [])])
+        
+        return success, links["behavior"], links["resource"]
     
     except Exception as e:
         console.print(f"❌ 提权过程出错: {str(e)}", style="red")
@@ -376,53 +872,83 @@ def setup_global_addons_symlinks(packs: list):
     Returns:
         tuple: (成功状态, 行为包链接列表, 资源包链接列表)
     """
-    if not is_windows():
+    if not _IS_WINDOWS:
         console.print("❌ 此功能仅支持Windows系统", style="red bold")
         return False, [], []
         
     try:
+        # 没有任何存在的包目录时同样走完整流程，以清理其他项目遗留的链接
+        pack_links = _collect_pack_links(packs)
+
         # 获取MC Studio用户数据目录
         user_data_path = get_mcs_game_engine_netease_data_path()
         if not user_data_path:
+            if not pack_links:
+                # 既没有需要链接的包，也没有可清理的目录
+                return True, [], []
             console.print("❌ 未找到MC Studio用户数据目录", style="red bold")
             return False, [], []
         
-        # 判断是否需要管理员权限
-        behavior_packs_dir = os.path.join(user_data_path, "behavior_packs")
-        resource_packs_dir = os.path.join(user_data_path, "resource_packs")
-        
-        need_admin = FORCE_ADMIN or (not (has_write_permission(behavior_packs_dir) and has_write_permission(resource_packs_dir)))
+        # 现有链接已与期望完全一致时无需任何写入，直接返回，也不必探测权限
+        link_tasks, desired_links = _plan_addon_links(user_data_path, pack_links)
+        if _addon_links_up_to_date(desired_links):
+            console.print(f"✅ Addons链接已是最新: 保留 {len(link_tasks)} 个链接", style="green")
+            return (
+                True,
+                [link_name for _, _, link_name, _, kind, _, _ in link_tasks if kind == "behavior"],
+                [link_name for _, _, link_name, _, kind, _, _ in link_tasks if kind == "resource"],
+            )
+
+        # 判断是否需要管理员权限：两个包目录都位于用户数据目录下并继承其权限，只需检查一次
+        need_admin = _needs_elevation(user_data_path)
         
         # 如果不需要管理员权限或已经是管理员，直接创建软链接
-        if not need_admin or is_admin():
-            return create_symlinks(user_data_path, packs)
+        if not need_admin:
+            return create_symlinks(user_data_path, packs, pack_links)
             
-        # 将包对象转换为简单字典
-        simple_packs = []
-        for pack in packs:
-            simple_pack = {
-                "behavior_pack_dir": pack.behavior_pack_dir if hasattr(pack, 'behavior_pack_dir') else None,
-                "resource_pack_dir": pack.resource_pack_dir if hasattr(pack, 'resource_pack_dir') else None,
-                "pkg_name": pack.pkg_name
-            }
-            simple_packs.append(simple_pack)
-        
-        # 获取辅助脚本路径
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        script_path = os.path.join(current_dir, "symlink_helper_global.py")
-        
-        if not os.path.exists(script_path):
-            console.print(f"⚠️ 辅助脚本不存在: {script_path}", style="yellow")
-            return False, [], []
-        
         # 以管理员权限运行辅助脚本
-        return admin_global_link(script_path, simple_packs, user_data_path)
+        return admin_global_link(link_tasks, desired_links)
         
     except Exception as e:
         console.print(f"❌ 设置软链接失败: {str(e)}", style="red bold")
         return False, [], []
     
     
+def _prepare_map_link(source, target, link_type, need_admin, live):
+    """
+    准备单个地图链接：移除已存在的目标（目标的上级目录即运行时地图目录，调用方已确认存在）
+    
+    Args:
+        source: 源目录
+        target: 链接路径
+        link_type: 链接类型（resource_packs / behavior_packs）
+        need_admin: 是否需要管理员权限
+        live: 用于显示状态的Live组件
+        
+    Returns:
+        dict: 链接信息；删除已有链接失败时返回None
+    """
+    # 如果目标已存在，需要先删除
+    if os.path.exists(target):
+        if os.path.islink(target):
+            if not need_admin:
+                try:
+                    os.unlink(target)
+                except Exception as e:
+                    console.print(f"⚠️ 删除失败: {link_type} ({str(e)})", style="yellow")
+                    return None
+        else:
+            # 删除此目录
+            live.update(Text(f"⚠️ 目标已存在且不是链接: {target}", style="yellow"))
+            os.rmdir(target)
+    
+    return {
+        "source": source,
+        "target": target,
+        "type": link_type
+    }
+
+
 def setup_map_packs_symlinks(src_map_dir: str, level_id: str, runtime_map_dir: str):
     """
     为地图创建资源包和行为包的软链接
@@ -434,7 +960,7 @@ def setup_map_packs_symlinks(src_map_dir: str, level_id: str, runtime_map_dir: s
     Returns:
         bool: 操作是否成功
     """
-    if not is_windows():
+    if not _IS_WINDOWS:
         click.secho("❌ 此功能仅支持Windows系统", fg="red", bold=True)
         return False
         
@@ -445,8 +971,11 @@ def setup_map_packs_symlinks(src_map_dir: str, level_id: str, runtime_map_dir: s
             click.secho("❌ 未找到MC Studio用户数据目录", fg="red", bold=True)
             return False
             
-        # 确保源地图目录存在
-        if not os.path.exists(src_map_dir):
+        # 扫描一次源地图目录，同时确认其存在并得到其中的资源包和行为包目录
+        try:
+            with os.scandir(src_map_dir) as it:
+                present = {entry.name for entry in it if entry.is_dir()}
+        except FileNotFoundError:
             click.secho(f"❌ 源地图目录不存在: {src_map_dir}", fg="red", bold=True)
             return False
             
@@ -455,87 +984,57 @@ def setup_map_packs_symlinks(src_map_dir: str, level_id: str, runtime_map_dir: s
             click.secho(f"❌ 运行时地图不存在: {level_id}", fg="red", bold=True)
             return False
         
-        console.print("🔗 正在创建地图软链接", style="cyan")
+        # 源地图与运行时地图中的资源包和行为包目录
+        map_links = [
+            (os.path.join(src_map_dir, name), os.path.join(runtime_map_dir, name), name, label)
+            for name, label in (("resource_packs", "资源包"), ("behavior_packs", "行为包"))
+            if name in present
+        ]
         
-        # 源地图资源包和行为包目录
-        src_map_resource_packs_dir = os.path.join(src_map_dir, "resource_packs")
-        src_map_behavior_packs_dir = os.path.join(src_map_dir, "behavior_packs")
+        # 如果没有需要创建的链接，直接返回成功，无需探测权限
+        if not map_links:
+            console.print("⚠️ 没有找到需要链接的资源包或行为包目录", style="yellow")
+            return True
         
-        # 运行时地图资源包和行为包目录
-        runtime_map_resource_packs_dir = os.path.join(runtime_map_dir, "resource_packs")
-        runtime_map_behavior_packs_dir = os.path.join(runtime_map_dir, "behavior_packs")
+        # 已指向正确源目录的链接原样保留，只处理缺失或指向错误的链接
+        pending_links = []
+        for source, target, link_type, label in map_links:
+            try:
+                if _normalize_link_target(os.readlink(target)) == _normalize_link_target(source):
+                    continue
+            except OSError:
+                pass
+            pending_links.append((source, target, link_type, label))
         
-        # 判断是否需要管理员权限
-        need_admin = FORCE_ADMIN or (
-            (os.path.exists(src_map_dir) and not has_write_permission(src_map_dir))
-        )
+        # 全部链接都已正确时无需任何写入，也不必探测权限
+        if not pending_links:
+            console.print("✅ 地图软链接已是最新", style="green")
+            return True
+        
+        console.print("🔗 正在创建地图软链接", style="cyan")
+        
+        # 判断是否需要管理员权限（源地图目录在上方已确认存在）
+        need_admin = _needs_elevation(src_map_dir)
         
         # 准备需要创建的链接信息
         links_to_create = []
         
         # 使用rich的Live组件来实现同行状态更新
         with Live("正在检查目录结构...", console=console, refresh_per_second=4) as live:
-            # 检查资源包目录
-            if os.path.exists(src_map_resource_packs_dir):
-                # 确保目标目录存在
-                os.makedirs(os.path.dirname(runtime_map_resource_packs_dir), exist_ok=True)
-                
-                # 如果目标已存在，需要先删除
-                if os.path.exists(runtime_map_resource_packs_dir):
-                    if os.path.islink(runtime_map_resource_packs_dir):
-                        if not need_admin or is_admin():
-                            try:
-                                os.unlink(runtime_map_resource_packs_dir)
-                            except Exception as e:
-                                console.print(f"⚠️ 删除失败: resource_packs ({str(e)})", style="yellow")
-                                return False
-                    else:
-                        # 删除此目录
-                        live.update(Text(f"⚠️ 目标已存在且不是链接: {runtime_map_resource_packs_dir}", style="yellow"))
-                        os.rmdir(runtime_map_resource_packs_dir)
-                        
-                links_to_create.append({
-                    "source": src_map_resource_packs_dir,
-                    "target": runtime_map_resource_packs_dir,
-                    "type": "resource_packs"
-                })
-                live.update(Text(f"✓ 已准备资源包链接: {src_map_resource_packs_dir}", style="green"))
-                    
-            # 检查行为包目录
-            if os.path.exists(src_map_behavior_packs_dir):
-                # 确保目标目录存在
-                os.makedirs(os.path.dirname(runtime_map_behavior_packs_dir), exist_ok=True)
-                
-                # 如果目标已存在，需要先删除
-                if os.path.exists(runtime_map_behavior_packs_dir):
-                    if os.path.islink(runtime_map_behavior_packs_dir):
-                        if not need_admin or is_admin():
-                            try:
-                                os.unlink(runtime_map_behavior_packs_dir)
-                            except Exception as e:
-                                console.print(f"⚠️ 删除失败: behavior_packs ({str(e)})", style="yellow")
-                                return False
-                    else:
-                        live.update(Text(f"⚠️ 目标已存在且不是链接: {runtime_map_behavior_packs_dir}", style="yellow"))
-                        os.rmdir(runtime_map_behavior_packs_dir)
-                        
-                links_to_create.append({
-                    "source": src_map_behavior_packs_dir,
-                    "target": runtime_map_behavior_packs_dir,
-                    "type": "behavior_packs"
-                })
-                live.update(Text(f"✓ 已准备行为包链接: {src_map_behavior_packs_dir}", style="green"))
-            
-            # 如果没有需要创建的链接，直接返回成功
-            if not links_to_create:
-                live.update(Text("⚠️ 没有找到需要链接的资源包或行为包目录", style="yellow"))
-                return True
+            # 检查资源包和行为包目录
+            for source, target, link_type, label in pending_links:
+                link = _prepare_map_link(source, target, link_type, need_admin, live)
+                if link is None:
+                    return False
+                links_to_create.append(link)
+                live.update(Text(f"✓ 已准备{label}链接: {source}", style="green"))
             
             live.update(Text(f"✓ 共发现 {len(links_to_create)} 个需要创建的链接", style="green"))
 
         # 如果不需要管理员权限或已经是管理员，直接创建链接
-        if not need_admin or is_admin():
+        if not need_admin:
             success = True
+            report = []
             
             with Progress(
                 SpinnerColumn(),
@@ -549,17 +1048,20 @@ def setup_map_packs_symlinks(src_map_dir: str, level_id: str, runtime_map_dir: s
                 for link in links_to_create:
                     progress.update(create_task, description=f"创建链接: {os.path.basename(link['target'])}")
                     try:
-                        os.symlink(link["source"], link["target"])
+                        _create_dir_symlink(link["source"], link["target"])
                         progress.advance(create_task)
                         # 简洁输出链接路径信息 - 源路径指向链接完整路径
                         source_path = link['source'].replace('\\', '/')
                         target_path = link['target'].replace('\\', '/')
-                        console.print(f"  ✓ {source_path} → {target_path}", style="green")
+                        report.append((f"  ✓ {source_path} → {target_path}", "green"))
                     except Exception as e:
-                        console.print(f"❌ 创建失败: {os.path.basename(link['target'])} ({str(e)})", style="red")
+                        report.append((f"❌ 创建失败: {os.path.basename(link['target'])} ({str(e)})", "red"))
                         success = False
                         
                 progress.update(create_task, description="链接创建完成", completed=True)
+            
+            # 一次性输出各链接的创建结果
+            _print_lines(report)
                     
             if success:
                 console.print("✅ 地图软链接设置完成！", style="green bold")
@@ -567,113 +1069,27 @@ def setup_map_packs_symlinks(src_map_dir: str, level_id: str, runtime_map_dir: s
                 console.print("❌ 部分链接创建失败", style="red bold")
             return success
             
-        # 如果需要管理员权限
-        # 获取辅助脚本路径
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        script_path = os.path.join(current_dir, "symlink_helper_map.py")
-        
-        # 创建临时结果文件
-        result_file = tempfile.mktemp(suffix='.json')
-        start_marker = f"{result_file}.started"
-        encoded_result = base64.b64encode(result_file.encode('utf-8')).decode('utf-8')
-        
-        # 确保脚本文件存在并有正确的内容
-        # 这里现在不需要创建脚本，因为我们已经有单独的symlink_helper_map.py文件
-        if not os.path.exists(script_path):
-            console.print(f"⚠️ 辅助脚本不存在: {script_path}", style="yellow")
+        # 如果需要管理员权限，交给辅助脚本创建，创建前先删除已有链接
+        result_data = _run_link_ops_as_admin(
+            [{"source": link["source"], "target": link["target"], "cleanup_first": True} for link in links_to_create],
+            "地图"
+        )
+        if result_data is None:
             return False
         
-        # 执行提权操作
-        console.print("🔒 需要管理员权限创建[地图]软链接，正在提权...", style="yellow")
-        
-        # 将链接数据编码为Base64
-        encoded_links = base64.b64encode(json.dumps(links_to_create).encode('utf-8')).decode('utf-8')
-        
-        # 构建命令行参数
-        params = f'"{script_path}" {encoded_links} {encoded_result}'
+        success = result_data.get("success", False)
+        created_links = result_data.get("created_links", [])
+        errors = result_data.get("errors", [])
         
-        # 执行提权
-        shellExecute = ctypes.windll.shell32.ShellExecuteW
-        result = shellExecute(None, "runas", sys.executable, params, None, 0)
-        
-        if result <= 32:  # ShellExecute返回值小于等于32表示失败
-            console.print("❌ 提权失败，无法创建软链接", style="red")
-            return False
-        
-        # 使用Live显示等待过程
-        with Live("等待管理员进程完成...", console=console, refresh_per_second=4) as live:
-            max_wait_time = 30  # 最多等待30秒
-            start_time = time.time()
-            script_started = False
-            
-            while time.time() - start_time < max_wait_time:
-                elapsed = time.time() - start_time
-                
-                # 检查启动标记
-                if not script_started and os.path.exists(start_marker):
-                    script_started = True
-                    live.update(Text(f"管理员进程已启动，正在执行... ({elapsed:.1f}秒)", style="cyan"))
-                else:
-                    live.update(Text(f"等待管理员进程完成... ({elapsed:.1f}秒)", style="yellow"))
-                
-                # 检查结果文件
-                if os.path.exists(result_file):
-                    try:
-                        with open(result_file, 'r') as f:
-                            result_data = json.load(f)
-                        
-                        # 删除临时文件
-                        try:
-                            os.remove(result_file)
-                            if os.path.exists(start_marker):
-                                os.remove(start_marker)
-                        except Exception as e:
-                            console.print(f"⚠️ 无法删除临时文件: {str(e)}", style="yellow")
-                        
-                        success = result_data.get("success", False)
-                        created_links = result_data.get("created_links", [])
-                        errors = result_data.get("errors", [])
-                        
-                        if success:
-                            live.update(Text("✅ 管理员进程成功完成", style="green"))
-                            console.print("✅ 地图软链接设置完成！", style="green bold")
-                            for link in created_links:
-                                console.print(f"  ✓ {link}", style="green")
-                        else:
-                            error = result_data.get("error", "详见错误列表")
-                            live.update(Text(f"⚠️ 管理员进程执行遇到问题: {error}", style="yellow"))
-                            console.print("❌ 地图软链接设置失败", style="red bold")
-                            for err in errors:
-                                console.print(f"  ✗ {err}", style="red")
-                        
-                        return success
-                    except json.JSONDecodeError:
-                        # 文件可能还在写入或格式不正确，等待一下
-                        pass
-                    except Exception as e:
-                        console.print(f"⚠️ 读取结果文件失败: {str(e)}", style="yellow")
-                
-                # 短暂休眠避免CPU占用过高
-                time.sleep(0.1)
-                
-            # 检查是否至少脚本已开始运行
-            if script_started:
-                live.update(Text("⚠️ 管理员进程启动了但未在规定时间内完成", style="yellow"))
-            else:
-                live.update(Text("⚠️ 管理员进程似乎没有启动", style="red"))
-            
-        console.print("⚠️ 等待操作完成超时", style="yellow")
+        if success:
+            console.print("✅ 地图软链接设置完成！", style="green bold")
+            _print_lines([(f"  ✓ {link}", "green") for link in created_links])
+        else:
+            error = result_data.get("error", "详见错误列表")
+            console.print(f"❌ 地图软链接设置失败: {error}", style="red bold")
+            _print_lines([(f"  ✗ {err}", "red") for err in errors])
         
-        # 清理可能存在的临时文件
-        try:
-            if os.path.exists(result_file):
-                os.remove(result_file)
-            if os.path.exists(start_marker):
-                os.remove(start_marker)
-        except:
-            pass
-            
-        return False
+        return success
             
     except Exception as e:
         console.print(f"❌ 设置地图软链接失败: {str(e)}", style="red bold")
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+"""
+共用的 Windows API 绑定
+
+导入时解析一次并声明参数类型，句柄按指针宽度传递，避免在64位系统上被截断。
+非Windows平台上只提供常量。
+"""
+
+import ctypes
+
+from .mcs import _IS_WINDOWS
+
+# 进程同步相关常量
+SYNCHRONIZE = 0x00100000
+INFINITE = 0xFFFFFFFF
+
+if _IS_WINDOWS:
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    OpenProcess = kernel32.OpenProcess
+    OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    OpenProcess.restype = wintypes.HANDLE
+
+    WaitForSingleObject = kernel32.WaitForSingleObject
+    WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    WaitForSingleObject.restype = wintypes.DWORD
+
+    CloseHandle = kernel32.CloseHandle
+    CloseHandle.argtypes = [wintypes.HANDLE]
+    CloseHandle.restype = wintypes.BOOL
@@ -7,31 +7,119 @@
 import os
 import sys
 import time
+import threading
 from datetime import datetime
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-    QTableWidget, QTableWidgetItem, QPushButton, QLabel, QHeaderView, 
+    QTableView, QPushButton, QLabel, QHeaderView, 
     QMessageBox, QSplitter, QTextEdit, QProgressBar, QFrame,
     QStyleFactory, QStatusBar, QCheckBox, QFileDialog, QGroupBox,
     QLineEdit, QListWidget, QListWidgetItem, QComboBox, QCompleter
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QStringListModel
-from PyQt5.QtGui import QIcon, QFont, QTextCursor, QColor, QPalette
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QStringListModel, QAbstractTableModel, QModelIndex, QSignalBlocker
+from PyQt5.QtGui import QIcon, QBrush, QFont, QFontDatabase, QTextCursor, QColor, QPalette
 
 # 导入项目模块
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from mcpywrap.commands.run_cmd import (
+from ..commands.run_cmd import (
     _get_all_instances, _generate_new_instance_config, _setup_dependencies, _run_game_with_instance,
-    _delete_instance, _clean_all_instances, get_project_name, config_exists,
+    _delete_instance, _clean_all_instances, get_project_name, config_exists, RUNTIME_DIR,
     base_dir as default_base_dir
 )
-from ..commands.edit_cmd import open_edit
 from ..config import get_project_dependencies
 from ..commands.add_cmd import add_dependency
 from ..commands.remove_cmd import remove_dependency
 from ..builders.dependency_manager import find_all_mcpywrap_packages
 
 
+# 日志区域最多保留的段落数
+LOG_MAX_BLOCKS = 2000
+
+# 日志级别对应的颜色
+LOG_COLORS = {
+    "error": "#FF5555",
+    "success": "#55AA55",
+    "info": "#5555FF",
+    "warning": "#FFAA00",
+    "normal": "#000000",
+}
+
+# 日志行HTML模板
+LOG_TEMPLATE = '<span style="color:#888888">[{ts}]</span> <span style="color:{c}">{m}</span>'.format
+
+# 优先使用的界面字体：微软雅黑、苹方、思源黑体等现代中文字体
+UI_FONT_FAMILIES = (
+    "Microsoft YaHei", "PingFang SC", "Hiragino Sans GB", "Source Han Sans CN",
+    "WenQuanYi Micro Hei", "SimHei"
+)
+
+# 已解析的界面字体，首次设置全局字体时确定
+_ui_font = None
+
+
+def _get_ui_font():
+    """返回系统中第一个可用的界面字体，结果在进程内缓存"""
+    global _ui_font
+    if _ui_font is None:
+        # QFontDatabase 需要在 QApplication 创建后才能使用，因此不在导入时解析
+        available = set(QFontDatabase().families())
+        family = next((f for f in UI_FONT_FAMILIES if f in available), None)
+        # 均不可用时沿用系统默认字体
+        _ui_font = QFont(family) if family else QFont()
+        _ui_font.setPointSize(9)
+    return _ui_font
+
+
+class InstanceTableModel(QAbstractTableModel):
+    """游戏实例列表数据模型，视图只查询可见单元格"""
+
+    HEADERS = ["默认", "实例ID", "创建时间", "世界名称"]
+    # 画刷只创建一次，避免每次绘制时重复构造颜色与画刷
+    LATEST_BRUSH = QBrush(QColor("#e0ffe0"))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.instances = []
+        self._rows = []
+
+    def set_instances(self, instances):
+        """设置实例列表，并一次性预先计算每行的显示文本"""
+        self.beginResetModel()
+        self.instances = instances
+        self._rows = [
+            (
+                "📌" if i == 0 else "",
+                inst['level_id'][:8],
+                datetime.fromtimestamp(inst['creation_time']).strftime('%Y-%m-%d %H:%M:%S'),
+                inst['name']
+            )
+            for i, inst in enumerate(instances)
+        ]
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self._rows[index.row()][index.column()]
+        if role == Qt.TextAlignmentRole and index.column() == 0:
+            return Qt.AlignCenter
+        if role == Qt.BackgroundRole and index.row() == 0:
+            # 最新实例
+            return self.LATEST_BRUSH
+        return None
+
+
 class GameInstanceManager(QMainWindow):
     """游戏实例管理器主窗口"""
     
@@ -40,16 +128,22 @@ class GameInstanceManager(QMainWindow):
         self.base_dir = base_dir
         self.current_project = get_project_name() if config_exists() else "未初始化项目"
         self.instances = []
+        # 上次加载实例列表时运行时目录的修改时间，未变化时跳过重新扫描
+        self._instances_cache_mtime = 0
         self.all_packs = None
         self.dependencies = []
+        # 日志先写入缓冲区，由定时器合并后一次性追加到日志区域
+        self._log_buffer = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_log)
         self.setup_ui()
         self.init_data()
 
     def setup_global_font(self):
         """设置全局字体为现代化中文字体"""
-        # 设置优先使用的字体：微软雅黑、苹方、思源黑体等现代中文字体
-        font = QFont("Microsoft YaHei, PingFang SC, Hiragino Sans GB, Source Han Sans CN, WenQuanYi Micro Hei, SimHei, sans-serif", 9)
-        QApplication.setFont(font)
+        QApplication.setFont(_get_ui_font())
         
     def setup_ui(self):
         """设置UI界面"""
@@ -82,7 +176,7 @@ class GameInstanceManager(QMainWindow):
         # 快速操作按钮
         refresh_btn = QPushButton("刷新")
         refresh_btn.setToolTip("刷新实例列表")
-        refresh_btn.clicked.connect(self.refresh_instances)
+        refresh_btn.clicked.connect(lambda: self.refresh_instances(force=True))
         info_layout.addWidget(refresh_btn)
         
         # 添加编辑器按钮
@@ -160,21 +254,24 @@ class GameInstanceManager(QMainWindow):
         instance_list_layout.addWidget(instance_title)
         
         # 实例列表表格
-        self.instance_table = QTableWidget(0, 4)
-        self.instance_table.setHorizontalHeaderLabels(["默认", "实例ID", "创建时间", "世界名称"])
+        self.instance_model = InstanceTableModel(self)
+        self.instance_table = QTableView()
+        self.instance_table.setModel(self.instance_model)
         self.instance_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
         self.instance_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
         self.instance_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
         self.instance_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
-        self.instance_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.instance_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.instance_table.setSelectionBehavior(QTableView.SelectRows)
+        self.instance_table.setEditTriggers(QTableView.NoEditTriggers)
         self.instance_table.setAlternatingRowColors(True)
-        self.instance_table.itemDoubleClicked.connect(self.on_instance_double_clicked)
+        self.instance_table.doubleClicked.connect(self.on_instance_double_clicked)
         self.instance_table.setStyleSheet("QTableView::item:selected { background-color: #e0f0ff; color: black; }")
         instance_list_layout.addWidget(self.instance_table)
         
-        # 实例操作按钮
-        btn_layout = QHBoxLayout()
+        # 实例操作按钮，放在同一个容器中以便整体启用/禁用
+        self.action_group = QWidget()
+        btn_layout = QHBoxLayout(self.action_group)
+        btn_layout.setContentsMargins(0, 0, 0, 0)
         
         self.new_btn = QPushButton("新建实例")
         self.new_btn.clicked.connect(self.create_new_instance)
@@ -194,7 +291,7 @@ class GameInstanceManager(QMainWindow):
         self.clean_btn.clicked.connect(self.clean_all_instances)
         btn_layout.addWidget(self.clean_btn)
         
-        instance_list_layout.addLayout(btn_layout)
+        instance_list_layout.addWidget(self.action_group)
         
         # 添加实例管理区域到垂直分割器
         v_splitter.addWidget(instance_list_widget)
@@ -209,6 +306,9 @@ class GameInstanceManager(QMainWindow):
         
         self.log_output = QTextEdit()
         self.log_output.setReadOnly(True)
+        # 限制日志历史行数，超出时由文档自动丢弃最早的段落，长时间运行内存保持恒定
+        self.log_output.setUndoRedoEnabled(False)
+        self.log_output.document().setMaximumBlockCount(LOG_MAX_BLOCKS)
         log_layout.addWidget(self.log_output)
         
         # 添加日志区域到垂直分割器
@@ -224,20 +324,28 @@ class GameInstanceManager(QMainWindow):
         h_splitter.setSizes([300, 700])
         
         # 连接选择变更信号
-        self.instance_table.itemSelectionChanged.connect(self.on_selection_changed)
+        self.instance_table.selectionModel().selectionChanged.connect(self.on_selection_changed)
     
     def init_data(self):
         """初始化数据"""
         if not config_exists():
             self.log("❌ 项目尚未初始化，请先运行 mcpy init", "error")
-            self.new_btn.setEnabled(False)
-            self.clean_btn.setEnabled(False)
+            self.action_group.setEnabled(False)  # 整体禁用实例操作按钮
             self.edit_btn.setEnabled(False)  # 禁用编辑按钮
             return
         
-        # 设置项目依赖
+        # 在后台线程中设置项目依赖，避免阻塞窗口显示；加载完成前禁用新建实例
         self.log("📦 正在加载项目依赖...")
-        self.all_packs = _setup_dependencies(self.current_project, self.base_dir)
+        self.new_btn.setEnabled(False)
+        self.dependency_progress = QProgressBar()
+        self.dependency_progress.setRange(0, 0)  # 不确定进度的忙碌指示
+        self.dependency_progress.setMaximumWidth(150)
+        self.statusBar().addPermanentWidget(self.dependency_progress)
+        self.statusBar().showMessage("正在加载项目依赖...")
+        self.dependency_thread = DependencyLoadThread(self.current_project, self.base_dir)
+        self.dependency_thread.log_message.connect(self.log)
+        self.dependency_thread.packs_ready.connect(self.on_packs_ready)
+        self.dependency_thread.start()
         
         # 加载实例列表
         self.refresh_instances()
@@ -248,6 +356,18 @@ class GameInstanceManager(QMainWindow):
         # 加载可用mcpywrap包
         self.load_available_packages()
     
+    def on_packs_ready(self, all_packs):
+        """项目依赖加载完成"""
+        self.all_packs = all_packs
+        self.statusBar().removeWidget(self.dependency_progress)
+        self.statusBar().clearMessage()
+        if all_packs is None:
+            self.log("❌ 项目依赖加载失败", "error")
+            return
+        self.log("✅ 项目依赖加载完成", "success")
+        self.new_btn.setEnabled(True)
+        self.on_selection_changed()
+    
     def load_available_packages(self):
         """加载系统中可用的mcpywrap包"""
         self.log("🔍 正在搜索系统中可用的mcpywrap包...", "info")
@@ -279,46 +399,29 @@ class GameInstanceManager(QMainWindow):
             # 可以在这里添加额外的处理逻辑
             pass
     
-    def refresh_instances(self):
-        """刷新实例列表"""
-        self.instances = _get_all_instances()
-        self.instance_table.setRowCount(0)
+    def refresh_instances(self, force=False):
+        """刷新实例列表，运行时目录未变化时直接返回，force为True时强制重新扫描"""
+        try:
+            mtime = os.stat(RUNTIME_DIR).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if not force and mtime == self._instances_cache_mtime:
+            return
+        self._instances_cache_mtime = mtime
+        
+        # 只重置模型，视图按需查询可见单元格，无需逐个创建表格项
+        self.instances = _get_all_instances(load_names=True)
+        # 重置期间屏蔽选择信号，结束后统一更新一次按钮状态
+        with QSignalBlocker(self.instance_table.selectionModel()):
+            self.instance_model.set_instances(self.instances)
+            if self.instances:
+                self.instance_table.selectRow(0)  # 默认选择第一行
+        self.on_selection_changed()
         
         if not self.instances:
             self.log("📭 没有找到任何游戏实例", "info")
-            self.run_btn.setEnabled(False)
-            self.delete_btn.setEnabled(False)
             return
         
-        self.instance_table.setRowCount(len(self.instances))
-        for row, instance in enumerate(self.instances):
-            # 状态图标
-            status_item = QTableWidgetItem("📌" if row == 0 else "")
-            status_item.setTextAlignment(Qt.AlignCenter)
-            
-            # 实例ID(显示前8位)
-            id_item = QTableWidgetItem(instance['level_id'][:8])
-            
-            # 创建时间
-            creation_time = datetime.fromtimestamp(instance['creation_time'])
-            time_str = creation_time.strftime('%Y-%m-%d %H:%M:%S')
-            time_item = QTableWidgetItem(time_str)
-            
-            # 世界名称
-            name_item = QTableWidgetItem(instance['name'])
-            
-            # 设置表格内容
-            self.instance_table.setItem(row, 0, status_item)
-            self.instance_table.setItem(row, 1, id_item)
-            self.instance_table.setItem(row, 2, time_item)
-            self.instance_table.setItem(row, 3, name_item)
-            
-            # 设置行背景色
-            if row == 0:  # 最新实例
-                for col in range(4):
-                    self.instance_table.item(row, col).setBackground(QColor("#e0ffe0"))
-        
-        self.instance_table.selectRow(0)  # 默认选择第一行
         self.log(f"✅ 已加载 {len(self.instances)} 个游戏实例", "success")
     
     def refresh_dependencies(self):
@@ -340,14 +443,15 @@ class GameInstanceManager(QMainWindow):
         # 禁用移除按钮，等待用户选择
         self.remove_dep_btn.setEnabled(False)
     
-    def on_selection_changed(self):
+    def on_selection_changed(self, selected=None, deselected=None):
         """选择变更事件处理"""
         selected_rows = self.instance_table.selectionModel().selectedRows()
         has_selection = len(selected_rows) > 0
-        self.run_btn.setEnabled(has_selection)
+        # 依赖加载完成前无法运行实例
+        self.run_btn.setEnabled(has_selection and self.all_packs is not None)
         self.delete_btn.setEnabled(has_selection)
     
-    def on_instance_double_clicked(self, item):
+    def on_instance_double_clicked(self, index):
         """双击实例表格项事件处理"""
         self.run_selected_instance()
     
@@ -374,6 +478,7 @@ class GameInstanceManager(QMainWindow):
         self.game_thread = GameRunThread(config_path, level_id, self.all_packs)
         self.game_thread.log_message.connect(self.log)
         self.game_thread.finished.connect(self.refresh_instances)
+        self.game_thread.game_exited.connect(lambda: self.refresh_instances(force=True))
         self.game_thread.start()
     
     def run_selected_instance(self):
@@ -396,6 +501,7 @@ class GameInstanceManager(QMainWindow):
         # 使用QThread启动游戏，避免UI卡死
         self.game_thread = GameRunThread(config_path, level_id, self.all_packs)
         self.game_thread.log_message.connect(self.log)
+        self.game_thread.game_exited.connect(lambda: self.refresh_instances(force=True))
         self.game_thread.start()
     
     def delete_selected_instance(self):
@@ -461,23 +567,28 @@ class GameInstanceManager(QMainWindow):
         timestamp = datetime.now().strftime("%H:%M:%S")
         
         # 根据日志级别设置颜色
-        if level == "error":
-            color = "#FF5555"
-        elif level == "success":
-            color = "#55AA55"
-        elif level == "info":
-            color = "#5555FF"
-        elif level == "warning":
-            color = "#FFAA00"
-        else:
-            color = "#000000"
-        
-        formatted_message = f'<span style="color:#888888">[{timestamp}]</span> <span style="color:{color}">{message}</span>'
-        self.log_output.append(formatted_message)
+        formatted_message = LOG_TEMPLATE(ts=timestamp, c=LOG_COLORS.get(level, "#000000"), m=message)
+        self._log_buffer.append(formatted_message)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+    
+    def _flush_log(self):
+        """将缓冲的日志一次性追加到日志区域，突发日志每50毫秒只重绘一次"""
+        if not self._log_buffer:
+            return
+        # 在文档末尾直接插入，整批日志合并为一个编辑块；每行单独成段，以便按段落数限制日志行数
+        document = self.log_output.document()
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        for line in self._log_buffer:
+            if not document.isEmpty():
+                cursor.insertBlock()
+            cursor.insertHtml(line)
+        cursor.endEditBlock()
+        self._log_buffer.clear()
         
         # 滚动到底部
-        cursor = self.log_output.textCursor()
-        cursor.movePosition(QTextCursor.End)
         self.log_output.setTextCursor(cursor)
     
     def open_mc_editor(self):
@@ -485,7 +596,9 @@ class GameInstanceManager(QMainWindow):
         if not config_exists():
             self.log("❌ 项目尚未初始化，无法打开编辑器", "error")
             return
-            
+        
+        # 编辑器相关模块较重，仅在打开编辑器时导入
+        from ..commands.edit_cmd import open_edit
         open_edit()
     
     def remove_selected_dependency(self):
@@ -552,6 +665,7 @@ class GameRunThread(QThread):
     """游戏运行线程"""
     log_message = pyqtSignal(str, str)
     game_started = pyqtSignal()  # 游戏成功启动信号
+    game_exited = pyqtSignal()  # 游戏进程退出信号
     
     def __init__(self, config_path, level_id, all_packs):
         super().__init__()
@@ -576,6 +690,9 @@ class GameRunThread(QThread):
             
             if success and self.game_process:
                 self.game_started.emit()  # 发送游戏已启动信号
+                # 由守护线程阻塞等待进程句柄，进程退出时由内核唤醒后发出信号，无需轮询；
+                # 启动线程本身随即结束
+                threading.Thread(target=self._wait_game_exit, daemon=True).start()
             
         except Exception as e:
             self.log_message.emit(f"❌ 运行游戏时出错: {str(e)}", "error")
@@ -583,6 +700,35 @@ class GameRunThread(QThread):
             error_details = traceback.format_exc()
             self.log_message.emit(f"错误详情:\n{error_details}", "error")
 
+    def _wait_game_exit(self):
+        """等待游戏进程退出并通知界面"""
+        try:
+            self.game_process.wait()
+        except Exception as e:
+            self.log_message.emit(f"⚠️ 等待游戏进程时出错: {str(e)}", "warning")
+            return
+        self.log_message.emit("👋 游戏已退出", "info")
+        self.game_exited.emit()
+
+
+class DependencyLoadThread(QThread):
+    """项目依赖加载线程"""
+    log_message = pyqtSignal(str, str)
+    packs_ready = pyqtSignal(object)  # 加载完成信号，失败时携带None
+
+    def __init__(self, project_name, base_dir):
+        super().__init__()
+        self.project_name = project_name
+        self.base_dir = base_dir
+
+    def run(self):
+        try:
+            all_packs = _setup_dependencies(self.project_name, self.base_dir)
+        except Exception as e:
+            self.log_message.emit(f"❌ 加载项目依赖时出错: {str(e)}", "error")
+            all_packs = None
+        self.packs_ready.emit(all_packs)
+
 
 class DependencyInstallThread(QThread):
     """依赖安装线程"""
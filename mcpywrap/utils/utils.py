@@ -3,22 +3,65 @@
 """
 通用工具函数
 """
+import os
+import json
 import subprocess
-from pathlib import Path
 import sys
 import click
 
+# orjson 为可选依赖，可用时用于加速JSON解析
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def json_loads(data):
+    """解析JSON字符串或字节串，优先使用orjson"""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_bytes(obj, indent=False):
+    """将对象序列化为UTF-8编码的JSON字节串，优先使用orjson；不缩进时输出紧凑格式"""
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def write_file_atomic(path, data):
+    """
+    原子地写入文件：先写入临时文件，再替换目标文件
+    
+    Args:
+        path: 目标文件路径
+        data: 要写入的字节数据
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'wb', buffering=0) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
 def validate_path(path_str):
     """验证路径是否有效"""
-    path = Path(path_str).expanduser().resolve()
-    return path.exists()
+    return os.path.exists(os.path.expanduser(path_str))
 
 def ensure_dir(path_str):
     """确保目录存在，如果不存在则创建"""
-    path = Path(path_str).expanduser().resolve()
-    if not path.exists():
-        path.mkdir(parents=True)
-    return str(path)
+    # 不解析符号链接，也不事先检查是否存在，exist_ok 同时处理并发创建的情况
+    path = os.path.abspath(os.path.expanduser(path_str))
+    os.makedirs(path, exist_ok=True)
+    return path
 
 def run_command(cmd, cwd=None, shell=False):
     """运行系统命令"""